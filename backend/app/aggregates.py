@@ -0,0 +1,218 @@
+from datetime import date
+from sqlalchemy import select, func, case, union_all, extract, tuple_, and_, not_
+from sqlalchemy.orm import Session
+from app.models import Match, Shootout, Goal, Player, CountryYearStat, PairStat, CountryStat, ScorerStat, ScorerYearStat
+
+
+def _team_sides():
+    """One row per team per match: the team, the year, and goals scored and conceded."""
+    home = select(
+        Match.home_team_id.label("country_id"),
+        extract("year", Match.match_date).label("year"),
+        func.coalesce(Match.home_score, 0).label("goals_for"),
+        func.coalesce(Match.away_score, 0).label("goals_against")
+    )
+    away = select(
+        Match.away_team_id.label("country_id"),
+        extract("year", Match.match_date).label("year"),
+        func.coalesce(Match.away_score, 0).label("goals_for"),
+        func.coalesce(Match.home_score, 0).label("goals_against")
+    )
+    return home, away
+
+
+def refresh_country_year_stats(db: Session, years=None):
+    """Rebuild ``country_year_stats`` from ``matches``.
+
+    With ``years``, only the span from the earliest to the latest of them is
+    rebuilt, which is what the incremental ETL passes after adding matches.
+    """
+    home, away = _team_sides()
+    delete = db.query(CountryYearStat)
+    if years:
+        first, last = min(years), max(years)
+        span = Match.match_date.between(date(first, 1, 1), date(last, 12, 31))
+        home, away = home.where(span), away.where(span)
+        delete = delete.filter(CountryYearStat.year.between(first, last))
+    delete.delete(synchronize_session=False)
+
+    sides = union_all(home, away).subquery()
+    rows = select(
+        sides.c.country_id,
+        sides.c.year,
+        func.count().label("matches"),
+        func.sum(case((sides.c.goals_for > sides.c.goals_against, 1), else_=0)).label("wins"),
+        func.sum(case((sides.c.goals_for == sides.c.goals_against, 1), else_=0)).label("draws"),
+        func.sum(case((sides.c.goals_for < sides.c.goals_against, 1), else_=0)).label("losses"),
+        func.sum(sides.c.goals_for).label("goals_for"),
+        func.sum(sides.c.goals_against).label("goals_against")
+    ).group_by(sides.c.country_id, sides.c.year)
+
+    columns = ["country_id", "year", "matches", "wins", "draws", "losses", "goals_for", "goals_against"]
+    result = db.execute(CountryYearStat.__table__.insert().from_select(columns, rows))
+    return result.rowcount
+
+
+def shootout_winner():
+    """The shootout winner of a drawn match, if it is one of the two teams (a few source rows name neither)."""
+    level = Match.home_score == Match.away_score
+    return case(
+        (level & (Shootout.winner_id == Match.home_team_id), Match.home_team_id),
+        (level & (Shootout.winner_id == Match.away_team_id), Match.away_team_id),
+        else_=None
+    )
+
+
+def match_winner():
+    """The winning team id, counting shootouts, as in the ``match_results`` view; NULL for a draw."""
+    return case(
+        (Match.home_score > Match.away_score, Match.home_team_id),
+        (Match.away_score > Match.home_score, Match.away_team_id),
+        else_=shootout_winner()
+    )
+
+
+def refresh_pair_stats(db: Session, years=None):
+    """Rebuild ``pair_stats``, one row per pair of countries that have met, lower id first.
+
+    With ``years``, only the pairs that played between the earliest and the
+    latest of them are rebuilt, over their whole history.
+    """
+    team_a = case((Match.home_team_id < Match.away_team_id, Match.home_team_id), else_=Match.away_team_id)
+    team_b = case((Match.home_team_id < Match.away_team_id, Match.away_team_id), else_=Match.home_team_id)
+    a_is_home = Match.home_team_id < Match.away_team_id
+    home_goals, away_goals = func.coalesce(Match.home_score, 0), func.coalesce(Match.away_score, 0)
+    winner, shootout = match_winner(), shootout_winner()
+
+    rows = select(
+        team_a.label("team_a_id"),
+        team_b.label("team_b_id"),
+        func.count().label("matches"),
+        func.sum(case((winner == team_a, 1), else_=0)).label("team_a_wins"),
+        func.sum(case((winner == team_b, 1), else_=0)).label("team_b_wins"),
+        func.sum(case((winner.is_(None), 1), else_=0)).label("draws"),
+        func.sum(case((a_is_home, home_goals), else_=away_goals)).label("team_a_goals"),
+        func.sum(case((a_is_home, away_goals), else_=home_goals)).label("team_b_goals"),
+        func.sum(case((shootout == team_a, 1), else_=0)).label("team_a_shootout_wins"),
+        func.sum(case((shootout == team_b, 1), else_=0)).label("team_b_shootout_wins"),
+        func.min(Match.match_date).label("first_match"),
+        func.max(Match.match_date).label("last_match")
+    ).outerjoin(Shootout, Shootout.match_id == Match.id)\
+     .where(Match.home_team_id != Match.away_team_id)\
+     .group_by(team_a, team_b)
+
+    delete = db.query(PairStat)
+    if years:
+        span = Match.match_date.between(date(min(years), 1, 1), date(max(years), 12, 31))
+        touched = select(team_a, team_b).where(span).distinct()
+        rows = rows.where(tuple_(team_a, team_b).in_(touched))
+        delete = delete.filter(tuple_(PairStat.team_a_id, PairStat.team_b_id).in_(touched))
+    delete.delete(synchronize_session=False)
+
+    columns = [
+        "team_a_id", "team_b_id", "matches", "team_a_wins", "team_b_wins", "draws", "team_a_goals",
+        "team_b_goals", "team_a_shootout_wins", "team_b_shootout_wins", "first_match", "last_match"
+    ]
+    result = db.execute(PairStat.__table__.insert().from_select(columns, rows))
+    return result.rowcount
+
+
+def refresh_country_stats(db: Session):
+    """Rebuild ``country_stats`` by adding up each country's side of ``pair_stats``."""
+    side_a = select(
+        PairStat.team_a_id.label("country_id"),
+        PairStat.matches,
+        PairStat.team_a_wins.label("wins"),
+        PairStat.draws,
+        PairStat.team_b_wins.label("losses")
+    )
+    side_b = select(
+        PairStat.team_b_id.label("country_id"),
+        PairStat.matches,
+        PairStat.team_b_wins.label("wins"),
+        PairStat.draws,
+        PairStat.team_a_wins.label("losses")
+    )
+    sides = union_all(side_a, side_b).subquery()
+    rows = select(
+        sides.c.country_id,
+        func.sum(sides.c.matches),
+        func.sum(sides.c.wins),
+        func.sum(sides.c.draws),
+        func.sum(sides.c.losses)
+    ).group_by(sides.c.country_id)
+
+    db.query(CountryStat).delete(synchronize_session=False)
+    columns = ["country_id", "matches_played", "wins", "draws", "losses"]
+    result = db.execute(CountryStat.__table__.insert().from_select(columns, rows))
+    return result.rowcount
+
+
+def refresh_scorer_stats(db: Session, player_ids=None, chunk_size=1000):
+    """Rebuild ``scorer_stats``, the goal count of every player who scored.
+
+    With ``player_ids``, only those players are recounted.
+    """
+    def rebuild(ids=None):
+        rows = select(Goal.player_id, Player.country_id, func.count(Goal.id))\
+            .join(Player, Player.id == Goal.player_id)\
+            .group_by(Goal.player_id, Player.country_id)
+        delete = db.query(ScorerStat)
+        if ids is not None:
+            rows = rows.where(Goal.player_id.in_(ids))
+            delete = delete.filter(ScorerStat.player_id.in_(ids))
+        delete.delete(synchronize_session=False)
+        columns = ["player_id", "country_id", "total_goals"]
+        return db.execute(ScorerStat.__table__.insert().from_select(columns, rows)).rowcount
+
+    if player_ids is None:
+        return rebuild()
+    player_ids = sorted(player_ids)
+    return sum(rebuild(player_ids[i:i + chunk_size]) for i in range(0, len(player_ids), chunk_size))
+
+
+def refresh_scorer_year_stats(db: Session, player_ids=None, years=None, chunk_size=1000):
+    """Rebuild ``scorer_year_stats``, goals per player per (year, tournament).
+
+    With ``years``, the span from the earliest to the latest of them is rebuilt
+    (matches there may have moved date or tournament); with ``player_ids``,
+    those players' rows are. Without either, the whole table is.
+    """
+    year = extract("year", Match.match_date)
+    own_goal = func.coalesce(Goal.own_goal, False)
+    penalty = func.coalesce(Goal.penalty, False)
+    rows = select(
+        Goal.player_id,
+        Player.country_id,
+        year.label("year"),
+        Match.tournament,
+        func.count(Goal.id),
+        func.sum(case((and_(penalty, not_(own_goal)), 1), else_=0)),
+        func.sum(case((own_goal, 1), else_=0))
+    ).join(Player, Player.id == Goal.player_id)\
+     .join(Match, Match.id == Goal.match_id)\
+     .group_by(Goal.player_id, Player.country_id, year, Match.tournament)
+    columns = ["player_id", "country_id", "year", "tournament", "goals", "penalties", "own_goals"]
+
+    def rebuild(where=None, delete_where=None):
+        delete = db.query(ScorerYearStat)
+        if delete_where is not None:
+            delete = delete.filter(delete_where)
+        delete.delete(synchronize_session=False)
+        query = rows.where(where) if where is not None else rows
+        return db.execute(ScorerYearStat.__table__.insert().from_select(columns, query)).rowcount
+
+    if player_ids is None and not years:
+        return rebuild()
+    written = 0
+    if years:
+        first, last = min(years), max(years)
+        written += rebuild(
+            Match.match_date.between(date(first, 1, 1), date(last, 12, 31)),
+            ScorerYearStat.year.between(first, last)
+        )
+    player_ids = sorted(player_ids or [])
+    for start in range(0, len(player_ids), chunk_size):
+        chunk = player_ids[start:start + chunk_size]
+        written += rebuild(Goal.player_id.in_(chunk), ScorerYearStat.player_id.in_(chunk))
+    return written
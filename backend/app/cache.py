@@ -0,0 +1,198 @@
+import os
+import time
+import pickle
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from starlette.concurrency import run_in_threadpool
+
+from app.database import SessionLocal
+from app.models import DataVersion
+
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+CACHE_TTL = int(os.getenv("CACHE_TTL", "3600"))
+# How long a process trusts its last read of data_version before asking the database again
+CACHE_VERSION_CHECK = float(os.getenv("CACHE_VERSION_CHECK", "5"))
+
+
+# === Backends ===
+
+class LRUCache:
+    """In-process cache bounded by entry count, with a TTL per entry."""
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisCache:
+    """Shared cache for several API processes; needs the optional ``redis`` package and ``CACHE_URL``."""
+
+    def __init__(self, url, ttl=CACHE_TTL, prefix="whybother:"):
+        import redis
+        self._client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key):
+        value = self._client.get(self.prefix + key)
+        return pickle.loads(value) if value is not None else None
+
+    def set(self, key, value):
+        self._client.set(self.prefix + key, pickle.dumps(value), ex=self.ttl)
+
+    def clear(self):
+        for key in self._client.scan_iter(self.prefix + "*"):
+            self._client.delete(key)
+
+
+class NullCache:
+    def get(self, key):
+        return None
+
+    def set(self, key, value):
+        pass
+
+    def clear(self):
+        pass
+
+
+def create_cache(backend=CACHE_BACKEND):
+    if backend == "memory":
+        return LRUCache()
+    if backend == "redis":
+        return RedisCache(os.getenv("CACHE_URL", "redis://localhost:6379/0"))
+    if backend == "none":
+        return NullCache()
+    raise ValueError(f"Unknown CACHE_BACKEND: {backend}")
+
+
+cache = create_cache()
+
+
+# === Data version ===
+
+def read_data_version(db):
+    row = db.get(DataVersion, 1)
+    return row.version if row else 0
+
+
+def bump_data_version(db):
+    """Advance the data version after a load; every cached response keyed on the old one goes stale."""
+    updated = db.query(DataVersion).filter(DataVersion.id == 1).update(
+        {DataVersion.version: DataVersion.version + 1, DataVersion.updated_at: datetime.now()},
+        synchronize_session=False
+    )
+    if not updated:
+        db.add(DataVersion(id=1, version=1, updated_at=datetime.now()))
+    db.commit()
+    return read_data_version(db)
+
+
+_version = {"value": None, "checked": 0.0}
+_version_lock = threading.Lock()
+
+
+def current_data_version():
+    """The data version, re-read from the database at most every ``CACHE_VERSION_CHECK`` seconds."""
+    with _version_lock:
+        if _version["value"] is not None and time.monotonic() - _version["checked"] < CACHE_VERSION_CHECK:
+            return _version["value"]
+    db = SessionLocal()
+    try:
+        value = read_data_version(db)
+    except Exception as e:
+        logging.warning(f"Could not read data_version, caching disabled for this request: {e}")
+        return None
+    finally:
+        db.close()
+    with _version_lock:
+        _version.update(value=value, checked=time.monotonic())
+    return value
+
+
+# === Routes ===
+
+def cache_key(request: Request, version):
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    return f"{version}:{request.url.path}?{query}"
+
+
+def etag_matches(request: Request, etag):
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    return header.strip() == "*" or etag in [tag.strip() for tag in header.split(",")]
+
+
+class CachedRoute(APIRoute):
+    """Route class for read-only routers: GET responses are cached per path, query string and data version.
+
+    Every cached response carries an ETag derived from the same key, so a client repeating a request
+    with ``If-None-Match`` gets a 304 until the ETL loads new data.
+    """
+
+    def data_version(self):
+        """The version responses are cached and tagged under; None serves the request uncached."""
+        return current_data_version()
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def cached_handler(request: Request):
+            if request.method != "GET":
+                return await handler(request)
+            version = await run_in_threadpool(self.data_version)
+            if version is None:
+                return await handler(request)
+
+            key = cache_key(request, version)
+            entry = cache.get(key)
+            if entry is None:
+                response = await handler(request)
+                body = getattr(response, "body", None)
+                if response.status_code != 200 or body is None:
+                    return response
+                headers = {k: v for k, v in response.headers.items() if k not in ("content-length", "content-type")}
+                headers["ETag"] = '"' + hashlib.sha1(key.encode() + body).hexdigest() + '"'
+                headers["Cache-Control"] = "no-cache"
+                entry = (body, response.media_type or response.headers.get("content-type"), headers)
+                cache.set(key, entry)
+
+            body, media_type, headers = entry
+            if etag_matches(request, headers["ETag"]):
+                return Response(status_code=304, headers={"ETag": headers["ETag"], "Cache-Control": "no-cache"})
+            return Response(content=body, media_type=media_type, headers=headers)
+
+        return cached_handler
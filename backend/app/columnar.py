@@ -0,0 +1,226 @@
+import os
+import time
+import logging
+import threading
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import select
+
+from app.database import SessionLocal
+from app.models import Country, Match, Player, Goal
+from app.cache import read_data_version
+
+# How often the background thread asks the database whether the ETL published a new data version
+RELOAD_CHECK = float(os.getenv("ANALYTICS_RELOAD_CHECK", "5"))
+
+EPOCH = np.datetime64("1970-01-01", "D")
+
+
+def _year_to_day(year):
+    return int((np.datetime64(f"{year:04d}-01-01", "D") - EPOCH).astype(np.int64))
+
+
+class ColumnarStore:
+    """An immutable columnar snapshot of matches and goals, answering the analytics queries with
+    NumPy masks and ``bincount`` instead of SQL.
+
+    Matches are kept sorted by (date, id) so a date range is a ``searchsorted`` slice. Each match
+    also contributes one "side" per team (goals for and against, scores coalesced to 0 as in
+    ``country_year_stats``); the sides are sorted by team so a country's matches are a slice too.
+    """
+
+    def __init__(self, version, matches, goals, countries, players):
+        self.version = version
+
+        matches = matches.sort_values(["match_date", "id"], kind="stable")
+        self.match_id = matches["id"].to_numpy(np.int32)
+        self.day = (matches["match_date"].to_numpy("datetime64[D]") - EPOCH).astype(np.int32)
+        self.home = matches["home_team_id"].to_numpy(np.int32)
+        self.away = matches["away_team_id"].to_numpy(np.int32)
+        self.home_null = matches["home_score"].isna().to_numpy()
+        self.away_null = matches["away_score"].isna().to_numpy()
+        self.home_score = matches["home_score"].fillna(0).to_numpy(np.int16)
+        self.away_score = matches["away_score"].fillna(0).to_numpy(np.int16)
+        codes, self.tournaments = pd.factorize(matches["tournament"], use_na_sentinel=True)
+        self.tournament = codes.astype(np.int16)
+        self.year = (self.day.astype("datetime64[D]").astype("datetime64[Y]").astype(np.int32) + 1970).astype(np.int16)
+
+        side_team = np.concatenate([self.home, self.away])
+        order = np.argsort(side_team, kind="stable")
+        self.side_team = side_team[order]
+        self.side_year = np.concatenate([self.year, self.year])[order]
+        self.side_for = np.concatenate([self.home_score, self.away_score])[order].astype(np.int32)
+        self.side_against = np.concatenate([self.away_score, self.home_score])[order].astype(np.int32)
+
+        self.goal_player = goals["player_id"].to_numpy(np.int32)
+
+        # Country rows stay plain dicts: a pandas frame would turn nullable integers into floats
+        self.countries = countries
+        size = max(countries, default=0) + 1
+        self.country_name = np.full(size, None, dtype=object)
+        for country_id, country in countries.items():
+            self.country_name[country_id] = country["name"]
+
+        # An empty frame reads its id column as float, so the ids are cast before indexing
+        player_ids = players["id"].to_numpy(np.int64)
+        size = int(player_ids.max()) + 1 if len(player_ids) else 1
+        self.player_name = np.full(size, None, dtype=object)
+        self.player_name[player_ids] = players["name"].to_numpy(object)
+        self.player_country = np.zeros(size, dtype=np.int32)
+        self.player_country[player_ids] = players["country_id"].fillna(0).to_numpy(np.int32)
+
+    @classmethod
+    def load(cls, db):
+        version = read_data_version(db)
+        conn = db.connection()
+        matches = pd.read_sql(select(
+            Match.id, Match.match_date, Match.home_team_id, Match.away_team_id,
+            Match.home_score, Match.away_score, Match.tournament
+        ), conn, parse_dates=["match_date"])
+        goals = pd.read_sql(select(Goal.player_id), conn)
+        countries = {
+            row.id: row._asdict() for row in db.execute(select(
+                Country.id, Country.name, Country.region, Country.continent, Country.population, Country.area_sq_km
+            ))
+        }
+        players = pd.read_sql(select(Player.id, Player.name, Player.country_id), conn)
+        return cls(version, matches, goals, countries, players)
+
+    # === Queries ===
+
+    def team_slice(self, country_id):
+        lo, hi = np.searchsorted(self.side_team, [country_id, country_id + 1])
+        return slice(lo, hi)
+
+    def country_summary(self, country_id, from_year=None, to_year=None):
+        """Matches, wins, draws, goals and wins per year of one country, optionally between two years."""
+        part = self.team_slice(country_id)
+        years, goals_for, against = self.side_year[part], self.side_for[part], self.side_against[part]
+        mask = np.ones(len(years), dtype=bool)
+        if from_year:
+            mask &= years >= from_year
+        if to_year:
+            mask &= years <= to_year
+        years, goals_for, against = years[mask], goals_for[mask], against[mask]
+        wins = goals_for > against
+
+        seen, index = np.unique(years, return_inverse=True)
+        wins_by_year = np.bincount(index, weights=wins, minlength=len(seen)).astype(int)
+        return {
+            "matches": int(len(years)),
+            "wins": int(wins.sum()),
+            "draws": int((goals_for == against).sum()),
+            "goals": int(goals_for.sum()),
+            "wins_per_year": [
+                {"year": int(y), "wins": int(w)} for y, w in zip(seen, wins_by_year) if w
+            ],
+        }
+
+    def team_totals(self):
+        """Per-country matches, wins and goals over all matches, indexed by country id."""
+        size = len(self.country_name)
+        matches = np.bincount(self.side_team, minlength=size)
+        wins = np.bincount(self.side_team, weights=self.side_for > self.side_against, minlength=size)
+        goals = np.bincount(self.side_team, weights=self.side_for, minlength=size)
+        return matches, wins.astype(np.int64), goals.astype(np.int64)
+
+    def year_slice(self, year):
+        lo, hi = np.searchsorted(self.day, [_year_to_day(year), _year_to_day(year + 1)])
+        return slice(lo, hi)
+
+    def year_matches(self, year):
+        # Already in (date, id) order, as slices.matches_query returns them
+        part = self.year_slice(year)
+        home, away = self.home[part], self.away[part]
+        home_score = np.where(self.home_null[part], -1, self.home_score[part])
+        away_score = np.where(self.away_null[part], -1, self.away_score[part])
+        dates = self.day[part].astype("datetime64[D]").astype(str)
+        tournaments = self.tournament[part]
+        return [
+            {
+                "date": dates[i],
+                "home": self.country_name[home[i]] if home[i] < len(self.country_name) else None,
+                "away": self.country_name[away[i]] if away[i] < len(self.country_name) else None,
+                "score": f"{home_score[i] if home_score[i] >= 0 else None}-{away_score[i] if away_score[i] >= 0 else None}",
+                "tournament": self.tournaments[tournaments[i]] if tournaments[i] >= 0 else None,
+            }
+            for i in range(len(home))
+        ]
+
+    def top_teams_by_goals(self, year, limit=5):
+        part = self.year_slice(year)
+        teams = np.concatenate([self.home[part], self.away[part]])
+        goals = np.concatenate([self.home_score[part], self.away_score[part]]).astype(np.int64)
+        played = np.unique(teams)
+        totals = np.bincount(teams, weights=goals)[played].astype(np.int64)
+        order = np.lexsort((played, -totals))[:limit]
+        return [
+            {"country_id": int(played[i]), "country": self.country_name[played[i]], "goals": int(totals[i])}
+            for i in order
+        ]
+
+    def top_scorers(self, limit=10):
+        counts = np.bincount(self.goal_player, minlength=len(self.player_name))
+        countries = self.player_country[:len(counts)]
+        # Players without a country are left out, as by the inner join in crud.get_top_scorers
+        counts = np.where(countries > 0, counts, 0)
+        candidates = np.flatnonzero(counts)
+        order = np.lexsort((candidates, -counts[candidates]))[:limit]
+        return [
+            (int(pid), self.player_name[pid], self.country_name[countries[pid]], int(counts[pid]))
+            for pid in candidates[order]
+        ]
+
+
+class ColumnarEngine:
+    """Holds the current ColumnarStore and swaps in a fresh one when the ETL bumps the data version.
+
+    Reloads happen on a background thread; requests only read ``store``, so they never touch the
+    database and never see a half-built snapshot.
+    """
+
+    def __init__(self, reload_check=RELOAD_CHECK):
+        self.reload_check = reload_check
+        self.store = None
+        self._thread = None
+        self._stop = threading.Event()
+
+    def reload(self):
+        start = time.perf_counter()
+        db = SessionLocal()
+        try:
+            store = ColumnarStore.load(db)
+        finally:
+            db.close()
+        self.store = store
+        logging.info(
+            f"Columnar analytics loaded data version {store.version}: {len(store.match_id)} matches, "
+            f"{len(store.goal_player)} goals in {time.perf_counter() - start:.2f}s"
+        )
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self.reload()
+        self._thread = threading.Thread(target=self._watch, name="columnar-reload", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _watch(self):
+        while not self._stop.wait(self.reload_check):
+            try:
+                db = SessionLocal()
+                try:
+                    version = read_data_version(db)
+                finally:
+                    db.close()
+                if version != self.store.version:
+                    self.reload()
+            except Exception as e:
+                logging.error(f"Columnar analytics reload failed, keeping version {self.store.version}: {e}")
+
+
+engine = ColumnarEngine()
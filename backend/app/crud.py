@@ -1,6 +1,7 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func, or_, desc, case
-from app.models import Country, Match, Player, Goal, Shootout, FormerName
+from datetime import date
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import func, or_, desc, case, extract
+from app.models import Country, Match, Player, Goal, Shootout, FormerName, CountryYearStat, TeamRating, PairStat, ScorerStat
 
 # === Countries ===
 def get_countries(db: Session):
@@ -24,47 +25,9 @@ def get_country_profile(db: Session, country_id: int):
     if not country:
         return None
 
-    stats = db.query(
-        func.count(Match.id).label("matches_played"),
-        func.sum(case([
-            ((Match.home_team_id == country_id) & (Match.home_score > Match.away_score), 1),
-            ((Match.away_team_id == country_id) & (Match.away_score > Match.home_score), 1)
-        ], else_=0)).label("wins"),
-        func.sum(case([
-            ((Match.home_team_id == country_id) & (Match.home_score < Match.away_score), 1),
-            ((Match.away_team_id == country_id) & (Match.away_score < Match.home_score), 1)
-        ], else_=0)).label("losses"),
-        func.sum(case([(Match.home_score == Match.away_score, 1)], else_=0)).label("draws")
-    ).filter(
-        or_(Match.home_team_id == country_id, Match.away_team_id == country_id)
-    ).first()
-
-    first_year = db.query(func.min(Match.match_date)).filter(
-        or_(Match.home_team_id == country_id, Match.away_team_id == country_id)
-    ).scalar()
-
-    last_year = db.query(func.max(Match.match_date)).filter(
-        or_(Match.home_team_id == country_id, Match.away_team_id == country_id)
-    ).scalar()
-
-    yearly = db.query(
-        func.year(Match.match_date).label("year"),
-        func.sum(case([
-            ((Match.home_team_id == country_id) & (Match.home_score > Match.away_score), 1),
-            ((Match.away_team_id == country_id) & (Match.away_score > Match.home_score), 1)
-        ], else_=0)).label("wins"),
-        func.sum(case([
-            ((Match.home_team_id == country_id) & (Match.home_score < Match.away_score), 1),
-            ((Match.away_team_id == country_id) & (Match.away_score < Match.home_score), 1)
-        ], else_=0)).label("losses"),
-        func.sum(case([(Match.home_score == Match.away_score, 1)], else_=0)).label("draws"),
-        func.count(Match.id).label("matches")
-    ).filter(
-        or_(Match.home_team_id == country_id, Match.away_team_id == country_id)
-    ).group_by(func.year(Match.match_date)).order_by(func.year(Match.match_date)).all()
-
+    yearly = get_country_year_stats(db, country_id)
     yearly_stats = [
-        dict(year=int(row.year), wins=int(row.wins), losses=int(row.losses), draws=int(row.draws), matches=int(row.matches))
+        dict(year=row.year, wins=row.wins, losses=row.losses, draws=row.draws, matches=row.matches)
         for row in yearly
     ]
 
@@ -76,14 +39,14 @@ def get_country_profile(db: Session, country_id: int):
             "population": country.population
         },
         "summary": {
-            "matches_played": int(stats.matches_played),
-            "wins": int(stats.wins),
-            "losses": int(stats.losses),
-            "draws": int(stats.draws)
+            "matches_played": sum(row.matches for row in yearly),
+            "wins": sum(row.wins for row in yearly),
+            "losses": sum(row.losses for row in yearly),
+            "draws": sum(row.draws for row in yearly)
         },
         "active_years": {
-            "from": first_year.year if first_year else None,
-            "to": last_year.year if last_year else None
+            "from": yearly[0].year if yearly else None,
+            "to": yearly[-1].year if yearly else None
         },
         "yearly_stats": yearly_stats
     }
@@ -100,6 +63,64 @@ def get_former_names_for_country(db: Session, country_id: int):
 def get_matches(db: Session):
     return db.query(Match).all()
 
+def filter_matches(query, date_from: date = None, date_to: date = None,
+                   tournament: str = None, team_id: int = None):
+    """Apply the optional list filters shared by the match endpoints."""
+    if date_from:
+        query = query.filter(Match.match_date >= date_from)
+    if date_to:
+        query = query.filter(Match.match_date <= date_to)
+    if tournament:
+        query = query.filter(Match.tournament == tournament)
+    if team_id:
+        query = query.filter((Match.home_team_id == team_id) | (Match.away_team_id == team_id))
+    return query
+
+def page_matches(query, after=None, limit: int = None):
+    """Keyset page on (match_date, id): seeks past the ``after`` position instead of using OFFSET.
+
+    Fetches ``limit + 1`` rows so the caller can tell whether there is a next page.
+    """
+    if after:
+        after_date, after_id = after
+        query = query.filter(
+            (Match.match_date > after_date) |
+            ((Match.match_date == after_date) & (Match.id > after_id))
+        )
+    query = query.order_by(Match.match_date, Match.id)
+    if limit:
+        query = query.limit(limit + 1)
+    return query.all()
+
+def matches_with_names_query(db: Session, **filters):
+    """Matches with team and host names joined in, as rows rather than ORM objects."""
+    home, away, host = aliased(Country), aliased(Country), aliased(Country)
+    query = db.query(
+        Match.id,
+        Match.match_date,
+        home.name.label("home_team"),
+        away.name.label("away_team"),
+        Match.home_score,
+        Match.away_score,
+        Match.tournament,
+        Match.city,
+        host.name.label("host_country"),
+        Match.neutral
+    ).outerjoin(home, Match.home_team_id == home.id)\
+     .outerjoin(away, Match.away_team_id == away.id)\
+     .outerjoin(host, Match.country_id == host.id)
+    return filter_matches(query, **filters)
+
+def get_matches_with_names(db: Session, after=None, limit: int = None, **filters):
+    return page_matches(matches_with_names_query(db, **filters), after, limit)
+
+def stream_matches_with_names(db: Session, batch_size: int = 1000, **filters):
+    """Iterate every matching row in (match_date, id) order over a server-side cursor,
+    holding at most ``batch_size`` rows in memory."""
+    return matches_with_names_query(db, **filters)\
+        .order_by(Match.match_date, Match.id)\
+        .yield_per(batch_size)
+
 def get_match_by_id(db: Session, match_id: int):
     return db.query(Match).filter(Match.id == match_id).first()
 
@@ -108,8 +129,22 @@ def get_matches_for_country(db: Session, country_id: int):
         (Match.home_team_id == country_id) | (Match.away_team_id == country_id)
     ).all()
 
-def get_matches_by_year(db: Session, year: int):
-    return db.query(Match).filter(func.year(Match.match_date) == year).all()
+def get_matches_for_country_with_names(db: Session, country_id: int, after=None, limit: int = None, **filters):
+    """A country's matches with both team names joined in, as rows rather than ORM objects."""
+    home, away = aliased(Country), aliased(Country)
+    query = db.query(
+        Match.id,
+        Match.match_date,
+        Match.home_team_id,
+        home.name.label("home_team"),
+        away.name.label("away_team"),
+        Match.home_score,
+        Match.away_score,
+        Match.tournament,
+        Match.city
+    ).outerjoin(home, Match.home_team_id == home.id)\
+     .outerjoin(away, Match.away_team_id == away.id)
+    return page_matches(filter_matches(query, team_id=country_id, **filters), after, limit)
 
 def add_match(db: Session, data: dict):
     match = Match(**data)
@@ -122,6 +157,38 @@ def add_match(db: Session, data: dict):
 def get_players(db: Session):
     return db.query(Player).all()
 
+def players_with_country_query(db: Session, country_id: int = None):
+    """Players with their country name joined in, as rows rather than ORM objects."""
+    query = db.query(
+        Player.id,
+        Player.name,
+        Player.country_id,
+        Country.name.label("country_name")
+    ).outerjoin(Country, Player.country_id == Country.id)
+    if country_id:
+        query = query.filter(Player.country_id == country_id)
+    return query
+
+def get_players_with_country(db: Session, after: int = None, limit: int = None, country_id: int = None):
+    """Keyset page on id; fetches ``limit + 1`` rows so the caller can tell whether there is a next page."""
+    query = players_with_country_query(db, country_id)
+    if after:
+        query = query.filter(Player.id > after)
+    query = query.order_by(Player.id)
+    if limit:
+        query = query.limit(limit + 1)
+    return query.all()
+
+def stream_players_with_country(db: Session, batch_size: int = 1000, country_id: int = None):
+    return players_with_country_query(db, country_id).order_by(Player.id).yield_per(batch_size)
+
+def get_players_with_country_by_ids(db: Session, player_ids):
+    """``{id: row}`` of the given players with their country name, for naming a leaderboard page."""
+    if not player_ids:
+        return {}
+    rows = players_with_country_query(db).filter(Player.id.in_(player_ids)).all()
+    return {row.id: row for row in rows}
+
 def get_player_by_id(db: Session, player_id: int):
     return db.query(Player).filter(Player.id == player_id).first()
 
@@ -165,14 +232,127 @@ def add_shootout(db: Session, data: dict):
 
 # === Scoring Analytics ===
 def get_top_scorers(db: Session, limit: int = 10):
+    """Players with the most goals, from the ETL-maintained ``scorer_stats`` totals."""
     return db.query(
         Player.id,
         Player.name,
         Country.name.label("country_name"),
-        func.count(Goal.id).label("total_goals")
-    ).join(Goal, Goal.player_id == Player.id)\
-     .join(Country, Player.country_id == Country.id)\
-     .group_by(Player.id)\
-     .order_by(desc("total_goals"))\
+        ScorerStat.total_goals
+    ).join(Player, Player.id == ScorerStat.player_id)\
+     .join(Country, ScorerStat.country_id == Country.id)\
+     .order_by(desc(ScorerStat.total_goals), ScorerStat.player_id)\
+     .limit(limit).all()
+
+def get_player_goals_per_match(db: Session, player_id: int):
+    """A player's goal count in each match they scored in, with the match year."""
+    return db.query(
+        Goal.match_id,
+        extract("year", Match.match_date).label("year"),
+        func.count(Goal.id).label("goals")
+    ).join(Match, Goal.match_id == Match.id)\
+     .filter(Goal.player_id == player_id)\
+     .group_by(Goal.match_id, Match.match_date).all()
+
+
+# === Aggregates ===
+def get_country_year_stats(db: Session, country_id: int, from_year: int = None, to_year: int = None):
+    query = db.query(CountryYearStat).filter(CountryYearStat.country_id == country_id)
+    if from_year:
+        query = query.filter(CountryYearStat.year >= from_year)
+    if to_year:
+        query = query.filter(CountryYearStat.year <= to_year)
+    return query.order_by(CountryYearStat.year).all()
+
+def get_country_summary(db: Session, country_id: int, from_year: int = None, to_year: int = None):
+    """Sum a country's per-year aggregates, optionally between two years inclusive."""
+    query = db.query(
+        func.coalesce(func.sum(CountryYearStat.matches), 0).label("matches"),
+        func.coalesce(func.sum(CountryYearStat.wins), 0).label("wins"),
+        func.coalesce(func.sum(CountryYearStat.draws), 0).label("draws"),
+        func.coalesce(func.sum(CountryYearStat.losses), 0).label("losses"),
+        func.coalesce(func.sum(CountryYearStat.goals_for), 0).label("goals_for"),
+        func.coalesce(func.sum(CountryYearStat.goals_against), 0).label("goals_against")
+    ).filter(CountryYearStat.country_id == country_id)
+    if from_year:
+        query = query.filter(CountryYearStat.year >= from_year)
+    if to_year:
+        query = query.filter(CountryYearStat.year <= to_year)
+    return query.one()
+
+def get_country_totals(db: Session):
+    """All-time wins and goals of every country, from the per-year aggregates."""
+    return db.query(
+        Country.id,
+        Country.name,
+        Country.population,
+        func.sum(CountryYearStat.matches).label("matches"),
+        func.coalesce(func.sum(CountryYearStat.wins), 0).label("wins"),
+        func.coalesce(func.sum(CountryYearStat.goals_for), 0).label("goals")
+    ).outerjoin(CountryYearStat, CountryYearStat.country_id == Country.id)\
+     .group_by(Country.id, Country.name, Country.population).all()
+
+# === Head to head ===
+def get_pair_stats(db: Session, team_a: int, team_b: int):
+    """The pair summary of two countries (stored with the lower id first), or None if they never met."""
+    low, high = sorted((team_a, team_b))
+    return db.query(PairStat).filter(PairStat.team_a_id == low, PairStat.team_b_id == high).first()
+
+def get_head_to_head_matches(db: Session, team_a: int, team_b: int, limit: int = 10):
+    """The most recent matches between two countries, with names and the shootout winner."""
+    home, away = aliased(Country), aliased(Country)
+    return db.query(
+        Match.id,
+        Match.match_date,
+        Match.home_team_id,
+        home.name.label("home_team"),
+        Match.away_team_id,
+        away.name.label("away_team"),
+        Match.home_score,
+        Match.away_score,
+        Match.tournament,
+        Shootout.winner_id.label("shootout_winner_id")
+    ).join(home, Match.home_team_id == home.id)\
+     .join(away, Match.away_team_id == away.id)\
+     .outerjoin(Shootout, Shootout.match_id == Match.id)\
+     .filter(or_(
+        (Match.home_team_id == team_a) & (Match.away_team_id == team_b),
+        (Match.home_team_id == team_b) & (Match.away_team_id == team_a)
+     ))\
+     .order_by(desc(Match.match_date), desc(Match.id))\
+     .limit(limit).all()
+
+# === Ratings ===
+def get_rating_ranking(db: Session, as_of: date = None, limit: int = 50):
+    """Countries by their latest Elo rating on or before ``as_of`` (default: today's ratings)."""
+    latest = db.query(TeamRating.country_id, func.max(TeamRating.id).label("id"))
+    if as_of:
+        latest = latest.filter(TeamRating.match_date <= as_of)
+    latest = latest.group_by(TeamRating.country_id).subquery()
+    return db.query(
+        TeamRating.country_id,
+        Country.name,
+        TeamRating.rating_after.label("rating"),
+        TeamRating.match_date.label("last_match")
+    ).join(latest, TeamRating.id == latest.c.id)\
+     .join(Country, Country.id == TeamRating.country_id)\
+     .order_by(desc(TeamRating.rating_after), TeamRating.country_id)\
      .limit(limit).all()
 
+def get_rating_history(db: Session, country_id: int, date_from: date = None, date_to: date = None):
+    """A country's rating after each of its matches, oldest first, with the opponent's name."""
+    opponent = aliased(Country)
+    query = db.query(
+        TeamRating.match_id,
+        TeamRating.match_date,
+        TeamRating.opponent_id,
+        opponent.name.label("opponent"),
+        TeamRating.result,
+        TeamRating.rating_before,
+        TeamRating.rating_after
+    ).join(opponent, opponent.id == TeamRating.opponent_id)\
+     .filter(TeamRating.country_id == country_id)
+    if date_from:
+        query = query.filter(TeamRating.match_date >= date_from)
+    if date_to:
+        query = query.filter(TeamRating.match_date <= date_to)
+    return query.order_by(TeamRating.match_date, TeamRating.id).all()
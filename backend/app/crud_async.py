@@ -0,0 +1,64 @@
+import asyncio
+from sqlalchemy import select, func, desc
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import AsyncSessionLocal
+from app.models import Country, CountryYearStat
+
+# Async counterparts of the crud functions behind the analytics routes.
+# An AsyncSession runs one statement at a time, so independent queries go
+# through gather(), which gives each its own session and connection.
+
+async def gather(*calls):
+    """Run ``(crud_function, *args)`` calls concurrently, each on its own session."""
+    async def run(call):
+        fn, *args = call
+        async with AsyncSessionLocal() as db:
+            return await fn(db, *args)
+    return await asyncio.gather(*(run(call) for call in calls))
+
+# === Countries ===
+async def get_country_by_id(db: AsyncSession, country_id: int):
+    return await db.get(Country, country_id)
+
+# === Matches ===
+async def get_rows(db: AsyncSession, statement):
+    """Run a prepared select, such as the ``app.slices`` statements, and return its rows."""
+    result = await db.execute(statement)
+    return result.all()
+
+# === Aggregates ===
+async def get_country_summary(db: AsyncSession, country_id: int, from_year: int = None, to_year: int = None):
+    query = select(
+        func.coalesce(func.sum(CountryYearStat.matches), 0).label("matches"),
+        func.coalesce(func.sum(CountryYearStat.wins), 0).label("wins"),
+        func.coalesce(func.sum(CountryYearStat.draws), 0).label("draws"),
+        func.coalesce(func.sum(CountryYearStat.goals_for), 0).label("goals_for")
+    ).where(CountryYearStat.country_id == country_id)
+    if from_year:
+        query = query.where(CountryYearStat.year >= from_year)
+    if to_year:
+        query = query.where(CountryYearStat.year <= to_year)
+    return (await db.execute(query)).one()
+
+async def get_top_countries(db: AsyncSession, column: str, limit: int = 10):
+    """Countries with the most all-time ``wins`` or ``goals_for``, among those that played."""
+    total = func.sum(getattr(CountryYearStat, column)).label("total")
+    result = await db.execute(
+        select(Country.name, total)
+        .join(CountryYearStat, CountryYearStat.country_id == Country.id)
+        .group_by(Country.id, Country.name)
+        .having(func.sum(CountryYearStat.matches) > 0)
+        .order_by(desc(total), Country.id)
+        .limit(limit)
+    )
+    return result.all()
+
+async def get_population_wins(db: AsyncSession):
+    result = await db.execute(
+        select(Country.name, Country.population, func.coalesce(func.sum(CountryYearStat.wins), 0).label("wins"))
+        .outerjoin(CountryYearStat, CountryYearStat.country_id == Country.id)
+        .where(Country.population.isnot(None), Country.population != 0)
+        .group_by(Country.id, Country.name, Country.population)
+        .order_by(Country.id)
+    )
+    return result.all()
@@ -1,46 +1,72 @@
 import os
+import time
+import hashlib
 import pandas as pd
 import logging
+import argparse
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from datetime import datetime
 from app.database import SessionLocal, engine
-from app.models import Country, FormerName, Match, Player, Goal, Shootout
+from app.models import Country, FormerName, Match, Player, Goal, Shootout, EtlState
+from app.aggregates import (
+    refresh_country_year_stats, refresh_pair_stats, refresh_country_stats, refresh_scorer_stats,
+    refresh_scorer_year_stats
+)
+from app.ratings import refresh_team_ratings
+from app.resolver import TeamResolver
+from app.cache import bump_data_version
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s: %(message)s")
 
-TEAM_ALIASES = {
-    "england": "United Kingdom",
-    "wales": "United Kingdom",
-    "china pr": "China",
-    "dr congo": "Democratic Republic of the Congo",
-    "republic of ireland": "Ireland",
-    "german dr": "East Germany",
-    "zaïre": "Democratic Republic of the Congo",
-    "viet nam": "Vietnam",
-    "ivory coast": "Cote d'Ivoire",
-    "côte d’ivoire": "Cote d'Ivoire",
-    "palestine": "Palestinian Territory",
-    "north macedonia": "Macedonia",
-    "iran": "Iran",
-    "curacao": "Curacao",
-    "czech republic": "Czechia",
-    "reunion": "Réunion",
-    "são tomé and príncipe": "Sao Tome and Principe",
-    "timor-leste": "Timor Leste"
-}
+@dataclass
+class RunChanges:
+    """What one ETL run wrote, so an incremental run only refreshes the summaries it touched.
 
-former_to_current = {}
+    ``run_pipeline`` makes a fresh one per run and hands it to the loaders and the refreshes.
+    """
+    # Years whose matches were inserted or updated
+    years: set = field(default_factory=set)
+    # Years whose shootouts were inserted or updated
+    shootout_years: set = field(default_factory=set)
+    # Players whose goals were inserted or updated
+    scorers: set = field(default_factory=set)
+    # Earliest date of each batch of matches or shootouts written;
+    # team ratings are recomputed from the earliest of them
+    rating_dates: set = field(default_factory=set)
 
-def map_team_name(name):
-    if not isinstance(name, str):
-        return None
-    key = name.strip().casefold()
-    if key in TEAM_ALIASES:
-        return TEAM_ALIASES[key]
-    if key in former_to_current:
-        return former_to_current[key]
-    return name.strip()
+    def __bool__(self):
+        return bool(self.years or self.shootout_years or self.scorers or self.rating_dates)
+
+# Rows per executemany batch in bulk mode
+BULK_CHUNK_SIZE = 5000
+
+# How many times a failing chunk is retried in streaming mode before it is split
+CHUNK_RETRIES = 1
+
+# Natural key used to link goal and shootout rows to their parent match
+MATCH_KEY = ["match_date", "home_team_id", "away_team_id"]
+
+MATCH_COLUMNS = [
+    "match_date", "home_team_id", "away_team_id", "home_score", "away_score",
+    "tournament", "city", "country_id", "neutral"
+]
+GOAL_COLUMNS = ["match_id", "player_id", "team_id", "minute", "own_goal", "penalty"]
+SHOOTOUT_COLUMNS = ["match_date", "home_team_id", "away_team_id", "winner_id", "first_shooter_id", "match_id"]
+
+# Keys used by incremental mode to tell an existing row from a new one. The
+# "occurrence" column numbers repeated keys so duplicate source rows stay distinct.
+MATCH_UPSERT_KEY = MATCH_KEY + ["occurrence"]
+GOAL_UPSERT_KEY = ["match_id", "player_id", "minute", "own_goal", "penalty", "occurrence"]
+SHOOTOUT_UPSERT_KEY = ["match_id"]
+
+QUARANTINE_DIR = os.getenv(
+    "ETL_QUARANTINE_DIR",
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "quarantine"))
+)
 
 def load_countries(path):
     session = SessionLocal()
@@ -92,7 +118,7 @@ def load_former_names(path):
     session = SessionLocal()
     try:
         df = pd.read_csv(path)
-        inserted = 0
+        inserted, skipped = 0, 0
         for _, row in df.iterrows():
             current_name = row["current"].strip()
             former = row["former"].strip()
@@ -100,18 +126,21 @@ def load_former_names(path):
             if not current_country:
                 logging.warning(f"Skipped former name '{former}' → '{current_name}': current country not found")
                 continue
-            former_to_current[former.casefold()] = current_name
+            exists = session.query(FormerName).filter_by(former_name=former, country_id=current_country.id).first()
+            if exists:
+                skipped += 1
+                continue
             fn = FormerName(
                 current_name=current_name,
                 former_name=former,
-                start_date=row["start_date"],
-                end_date=row["end_date"],
+                start_date=pd.to_datetime(row["start_date"]).date() if pd.notna(row["start_date"]) else None,
+                end_date=pd.to_datetime(row["end_date"]).date() if pd.notna(row["end_date"]) else None,
                 country_id=current_country.id
             )
             session.add(fn)
             inserted += 1
         session.commit()
-        logging.info(f" Former names loaded: {inserted} entries inserted.")
+        logging.info(f" Former names loaded: {inserted} entries inserted, {skipped} already present.")
     except Exception as e:
         logging.error(f"Error loading former names: {e}")
     finally:
@@ -119,26 +148,26 @@ def load_former_names(path):
 
 def load_matches(path):
     session = SessionLocal()
+    resolver = TeamResolver.load(session)
     df = pd.read_csv(path)
     skipped = 0
     for _, row in df.iterrows():
-        home_name = map_team_name(row["home_team"])
-        away_name = map_team_name(row["away_team"])
-        home = session.query(Country).filter_by(name=home_name).first()
-        away = session.query(Country).filter_by(name=away_name).first()
-        host = session.query(Country).filter_by(name=row["country"]).first()
-        if not home or not away:
+        match_date = pd.to_datetime(row["date"], errors="coerce")
+        home_id = resolver.resolve_name(row["home_team"], match_date)
+        away_id = resolver.resolve_name(row["away_team"], match_date)
+        host_id = resolver.resolve_name(row["country"], match_date)
+        if home_id is None or away_id is None:
             skipped += 1
             continue
         match = Match(
-            match_date=pd.to_datetime(row["date"], errors="coerce"),
-            home_team_id=home.id,
-            away_team_id=away.id,
+            match_date=match_date,
+            home_team_id=home_id,
+            away_team_id=away_id,
             home_score=row["home_score"],
             away_score=row["away_score"],
             tournament=row["tournament"],
             city=row["city"],
-            country_id=host.id if host else None,
+            country_id=host_id,
             neutral=row["neutral"]
         )
         session.add(match)
@@ -148,6 +177,7 @@ def load_matches(path):
 
 def load_goalscorers(path):
     session = SessionLocal()
+    resolver = TeamResolver.load(session)
     df = pd.read_csv(path)
     df["date"] = pd.to_datetime(df["date"], errors="coerce", dayfirst=True)
     inserted, skipped = 0, 0
@@ -155,19 +185,16 @@ def load_goalscorers(path):
         if pd.isna(row["date"]):
             skipped += 1
             continue
-        home = map_team_name(row["home_team"])
-        away = map_team_name(row["away_team"])
-        team = map_team_name(row["team"])
-        home_team = session.query(Country).filter_by(name=home).first()
-        away_team = session.query(Country).filter_by(name=away).first()
-        team_country = session.query(Country).filter_by(name=team).first()
-        if not home_team or not away_team or not team_country:
+        home_id = resolver.resolve_name(row["home_team"], row["date"])
+        away_id = resolver.resolve_name(row["away_team"], row["date"])
+        team_id = resolver.resolve_name(row["team"], row["date"])
+        if home_id is None or away_id is None or team_id is None:
             skipped += 1
             continue
         match = session.query(Match).filter(
             Match.match_date == row["date"],
-            Match.home_team_id == home_team.id,
-            Match.away_team_id == away_team.id
+            Match.home_team_id == home_id,
+            Match.away_team_id == away_id
         ).first()
         if not match:
             skipped += 1
@@ -176,15 +203,15 @@ def load_goalscorers(path):
         if not scorer:
             skipped += 1
             continue
-        player = session.query(Player).filter_by(name=scorer, country_id=team_country.id).first()
+        player = session.query(Player).filter_by(name=scorer, country_id=team_id).first()
         if not player:
-            player = Player(name=scorer, country_id=team_country.id)
+            player = Player(name=scorer, country_id=team_id)
             session.add(player)
             session.flush()
         goal = Goal(
             match_id=match.id,
             player_id=player.id,
-            team_id=team_country.id,
+            team_id=team_id,
             own_goal=row["own_goal"],
             penalty=row["penalty"]
         )
@@ -199,27 +226,24 @@ def load_goalscorers(path):
 
 def load_shootouts(path):
     session = SessionLocal()
+    resolver = TeamResolver.load(session)
     df = pd.read_csv(path)
     df["date"] = pd.to_datetime(df["date"], errors="coerce", format="%Y-%m-%d")
     inserted, skipped = 0, 0
     for _, row in df.iterrows():
-        home = map_team_name(row["home_team"])
-        away = map_team_name(row["away_team"])
-        winner = map_team_name(row["winner"])
-        first = map_team_name(row["first_shooter"])
-        home_team = session.query(Country).filter_by(name=home).first()
-        away_team = session.query(Country).filter_by(name=away).first()
-        winner_team = session.query(Country).filter_by(name=winner).first()
-        first_team = session.query(Country).filter_by(name=first).first()
-
-        if not home_team or not away_team or not winner_team:
+        home_id = resolver.resolve_name(row["home_team"], row["date"])
+        away_id = resolver.resolve_name(row["away_team"], row["date"])
+        winner_id = resolver.resolve_name(row["winner"], row["date"])
+        first_id = resolver.resolve_name(row["first_shooter"], row["date"])
+
+        if home_id is None or away_id is None or winner_id is None:
             skipped += 1
             continue
 
         match = session.query(Match).filter(
             Match.match_date == row["date"],
-            Match.home_team_id == home_team.id,
-            Match.away_team_id == away_team.id
+            Match.home_team_id == home_id,
+            Match.away_team_id == away_id
         ).first()
 
         if not match:
@@ -228,10 +252,10 @@ def load_shootouts(path):
 
         shootout = Shootout(
             match_date=row["date"],
-            home_team_id=home_team.id,
-            away_team_id=away_team.id,
-            winner_id=winner_team.id,
-            first_shooter_id=first_team.id if first_team else None,
+            home_team_id=home_id,
+            away_team_id=away_id,
+            winner_id=winner_id,
+            first_shooter_id=first_id,
             match_id=match.id
         )
         session.add(shootout)
@@ -241,12 +265,818 @@ def load_shootouts(path):
     session.close()
     logging.info(f"✅ Shootouts loaded successfully. Inserted: {inserted}, Skipped: {skipped}")
 
-import os
-base_path = os.path.join(os.path.dirname(__file__), "..", "datas")
+
+# === Bulk mode ===
+# Team names are resolved a column at a time by an in-memory TeamResolver,
+# and rows are written in executemany chunks.
+
+@contextmanager
+def timed_stage(name):
+    stage = {"rows": 0}
+    start = time.perf_counter()
+    try:
+        yield stage
+    finally:
+        elapsed = time.perf_counter() - start
+        logging.info(f"[{name}] {stage['rows']} rows in {elapsed:.2f}s")
+
+def resolve_team_ids(df, columns, resolver, date_column=None):
+    """Add a ``<column>_id`` column for each team-name column, NaN where unknown, and log the unknown names."""
+    dates = df[date_column] if date_column else None
+    for column in columns:
+        df = df.assign(**{f"{column}_id": resolver.resolve(df[column], dates)})
+        unknown = df.loc[df[f"{column}_id"].isna(), column].dropna().value_counts()
+        if len(unknown):
+            logging.warning(
+                f"{unknown.sum()} {column} values left unresolved ({len(unknown)} names): "
+                + ", ".join(f"'{name}' x{count}" for name, count in unknown.head(10).items())
+            )
+    return df
+
+def to_records(df, columns):
+    """Convert ``columns`` of ``df`` to plain-Python dicts, with NULL for missing values."""
+    out = df[columns].copy()
+    for column in columns:
+        if column == "id" or column.endswith("_id") or column == "minute":
+            out[column] = out[column].astype("Int64")
+        elif pd.api.types.is_datetime64_any_dtype(out[column]):
+            out[column] = out[column].dt.date
+    out = out.astype(object)
+    return out.where(out.notna(), None).to_dict("records")
+
+def bulk_insert(session, model, records, chunk_size=BULK_CHUNK_SIZE):
+    for start in range(0, len(records), chunk_size):
+        session.bulk_insert_mappings(model, records[start:start + chunk_size])
+    return len(records)
+
+def bulk_update(session, model, records, chunk_size=BULK_CHUNK_SIZE):
+    for start in range(0, len(records), chunk_size):
+        session.bulk_update_mappings(model, records[start:start + chunk_size])
+    return len(records)
+
+def build_match_index(session, date_range=None):
+    """Return match ids as a Series hash-indexed by ``(match_date, home_team_id, away_team_id)``.
+
+    ``date_range`` limits the index to matches played between two dates, inclusive.
+    """
+    query = session.query(Match.match_date, Match.home_team_id, Match.away_team_id, Match.id)
+    if date_range is not None:
+        query = query.filter(Match.match_date.between(*date_range))
+    index = pd.DataFrame(query.all(), columns=MATCH_KEY + ["match_id"])
+    index["match_date"] = pd.to_datetime(index["match_date"])
+    return index.drop_duplicates(MATCH_KEY).set_index(MATCH_KEY)["match_id"]
+
+def load_match_index():
+    session = SessionLocal()
+    try:
+        with timed_stage("match index") as stage:
+            match_index = build_match_index(session)
+            stage["rows"] = len(match_index)
+        return match_index
+    finally:
+        session.close()
+
+def link_match_ids(df, match_index, date_column):
+    """Add a ``match_id`` column by a vectorized lookup in ``match_index``, NaN where unmatched."""
+    keys = pd.MultiIndex.from_arrays(
+        [df[date_column], df["home_team_id"].astype("int64"), df["away_team_id"].astype("int64")],
+        names=MATCH_KEY
+    )
+    return df.assign(match_id=match_index.reindex(keys).to_numpy())
+
+def quarantine_path(name):
+    return os.path.join(QUARANTINE_DIR, f"orphan_{name}.csv")
+
+def write_quarantine(name, rejected, append=False):
+    """Write rejected source rows, with a ``reason`` column, to ``QUARANTINE_DIR/orphan_<name>.csv``.
+
+    With ``append`` the rows are added to the existing file instead of replacing it.
+    """
+    rows = pd.concat(rejected, ignore_index=True) if rejected else pd.DataFrame()
+    if append and not len(rows):
+        return
+    os.makedirs(QUARANTINE_DIR, exist_ok=True)
+    path = quarantine_path(name)
+    if append:
+        rows.to_csv(path, mode="a", header=not os.path.exists(path), index=False)
+    else:
+        rows.to_csv(path, index=False)
+    if len(rows):
+        logging.warning(f"{len(rows)} {name} rows quarantined to {path}")
+
+def build_player_index(session, names=None):
+    """Return a ``(name, country_id) -> player_id`` dict of known players, optionally only ``names``."""
+    query = session.query(Player.id, Player.name, Player.country_id)
+    if names is not None:
+        query = query.filter(Player.name.in_(names))
+    return {(name, country_id): player_id for player_id, name, country_id in query}
+
+def resolve_player_ids(session, df, player_index):
+    """Add a ``player_id`` column, bulk-inserting unknown players in one batch.
+
+    ``player_index`` is updated in place. Returns the frame and the number of
+    players created and reused.
+    """
+    keys = df[["scorer", "team_id"]].drop_duplicates()
+    keys = [(name, int(team_id)) for name, team_id in keys.itertuples(index=False)]
+    new_players = [key for key in keys if key not in player_index]
+    if new_players:
+        bulk_insert(session, Player, [{"name": name, "country_id": team_id} for name, team_id in new_players])
+        session.flush()
+        player_index.update(build_player_index(session, sorted({name for name, _ in new_players})))
+    player_ids = [player_index[(name, int(team_id))] for name, team_id in zip(df["scorer"], df["team_id"])]
+    return df.assign(player_id=player_ids), len(new_players), len(keys) - len(new_players)
+
+# === Incremental mode ===
+# Each source CSV's checksum and high-water mark (latest date loaded) are kept in
+# etl_state. An unchanged file is skipped; for a changed one, rows past the
+# high-water mark are appended directly and older rows are diffed against the
+# database so only new or corrected rows are written.
+
+def file_checksum(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def get_etl_state(session, source):
+    return session.query(EtlState).filter(EtlState.source == source).first()
+
+def save_etl_state(session, source, checksum, high_water_mark, row_count):
+    state = get_etl_state(session, source) or EtlState(source=source)
+    state.checksum = checksum
+    state.high_water_mark = high_water_mark.date() if pd.notna(high_water_mark) else None
+    state.row_count = row_count
+    state.loaded_at = datetime.utcnow()
+    session.add(state)
+
+def add_occurrence(df, key):
+    """Number rows sharing the same ``key`` so duplicates can be told apart."""
+    return df.assign(occurrence=df.groupby(key, dropna=False).cumcount())
+
+def existing_frame(session, model, columns, date_range=None):
+    """Return ``id`` plus ``columns`` of rows of ``model`` as a frame, in id order.
+
+    ``date_range`` limits it to rows whose match was played between two dates, inclusive.
+    """
+    query = session.query(model.id, *[getattr(model, c) for c in columns])
+    if date_range is not None:
+        if model is Goal:
+            query = query.join(Match, Goal.match_id == Match.id)
+        date_column = Shootout.match_date if model is Shootout else Match.match_date
+        query = query.filter(date_column.between(*date_range))
+    existing = pd.DataFrame(query.order_by(model.id).all(), columns=["id"] + columns)
+    if "match_date" in columns:
+        existing["match_date"] = pd.to_datetime(existing["match_date"])
+    return existing
+
+def split_delta(df, existing, key, payload, date_column, high_water_mark):
+    """Split ``df`` into rows to insert and rows to update.
+
+    Rows dated after ``high_water_mark`` are new by definition. Older rows (all
+    rows when there is no mark yet) are matched against ``existing`` on ``key``:
+    unmatched ones are inserted and matched ones whose ``payload`` differs are
+    returned with the existing ``id``.
+    """
+    if high_water_mark is None:
+        after = pd.Series(False, index=df.index)
+    else:
+        after = df[date_column] > pd.Timestamp(high_water_mark)
+    merged = df[~after].merge(existing.drop_duplicates(key), on=key, how="left", suffixes=("", "_db"))
+    missing = merged["id"].isna()
+    changed = pd.Series(False, index=merged.index)
+    for column in payload:
+        ours, theirs = merged[column], merged[f"{column}_db"]
+        changed |= ~((ours == theirs).fillna(False) | (ours.isna() & theirs.isna()))
+    inserts = pd.concat([df[after], merged.loc[missing, df.columns]], ignore_index=True)
+    return inserts, merged[~missing & changed]
+
+def needs_diff(df, date_column, high_water_mark):
+    """True when some row of ``df`` is not past ``high_water_mark`` and may already be stored."""
+    return high_water_mark is None or df[date_column].min() <= pd.Timestamp(high_water_mark)
+
+def date_range(df, date_column):
+    return df[date_column].min().date(), df[date_column].max().date()
+
+# === Bulk mode loaders ===
+
+def transform_matches(df, resolver):
+    """Resolve results.csv rows. Returns the loadable rows and the rejected source rows."""
+    source_columns = list(df.columns)
+    df = df.assign(match_date=pd.to_datetime(df["date"], errors="coerce", format="%Y-%m-%d"))
+    df = resolve_team_ids(df, ["home_team", "away_team", "country"], resolver, "match_date")
+    valid = df["home_team_id"].notna() & df["away_team_id"].notna() & df["match_date"].notna()
+    return df[valid], df.loc[~valid, source_columns].assign(reason="unknown_team")
+
+def transform_goalscorers(df, resolver):
+    """Resolve goalscorers.csv team names. Returns the loadable rows and the rejected source rows."""
+    source_columns = list(df.columns)
+    df = df.assign(
+        date=pd.to_datetime(df["date"], errors="coerce", format="%Y-%m-%d"),
+        scorer=df["scorer"].astype("string").str.strip()
+    )
+    df = resolve_team_ids(df, ["home_team", "away_team", "team"], resolver, "date")
+    valid = (
+        df["date"].notna() & df["scorer"].fillna("").ne("")
+        & df["home_team_id"].notna() & df["away_team_id"].notna() & df["team_id"].notna()
+    )
+    return df[valid], df.loc[~valid, source_columns].assign(reason="unresolved")
+
+def transform_shootouts(df, resolver):
+    """Resolve shootouts.csv team names. Returns the loadable rows and the rejected source rows."""
+    source_columns = list(df.columns)
+    df = df.assign(match_date=pd.to_datetime(df["date"], errors="coerce", format="%Y-%m-%d"))
+    df = resolve_team_ids(df, ["home_team", "away_team", "winner", "first_shooter"], resolver, "match_date")
+    valid = (
+        df["match_date"].notna() & df["home_team_id"].notna()
+        & df["away_team_id"].notna() & df["winner_id"].notna()
+    )
+    return df[valid], df.loc[~valid, source_columns].assign(reason="unresolved")
+
+TRANSFORMS = {
+    "matches": transform_matches,
+    "goalscorers": transform_goalscorers,
+    "shootouts": transform_shootouts,
+}
+
+def load_name_index():
+    """Return the TeamResolver that ``parse_source`` needs, built from countries and former names."""
+    session = SessionLocal()
+    try:
+        return TeamResolver.load(session)
+    finally:
+        session.close()
+
+def parse_source(kind, path, resolver):
+    """Read and resolve one source CSV without touching the database.
+
+    Safe to run in a worker process. Returns a dict with the loadable rows
+    (``df``), the rejected source rows and the raw row count and columns.
+    """
+    raw = pd.read_csv(path)
+    df, rejected = TRANSFORMS[kind](raw, resolver)
+    return {"path": path, "rows": len(raw), "columns": list(raw.columns), "df": df, "rejected": rejected}
+
+def source_changed(path):
+    """Return False when ``path`` still has the checksum recorded by its last load."""
+    session = SessionLocal()
+    try:
+        state = get_etl_state(session, os.path.basename(path))
+    finally:
+        session.close()
+    if state is not None and state.checksum == file_checksum(path):
+        logging.info(f"{os.path.basename(path)} unchanged since last load, skipping")
+        return False
+    return True
+
+def source_state(session, path):
+    """Return the stored high-water mark for ``path`` and its current checksum."""
+    state = get_etl_state(session, os.path.basename(path))
+    return (state.high_water_mark if state else None), file_checksum(path)
+
+def load_matches_frame(session, df, incremental=False, high_water_mark=None, chunked=False, changes=None):
+    """Insert new and update changed parsed match rows. Returns ``(inserted, updated, rejected)``.
+
+    ``chunked`` restricts the incremental diff to the dates present in ``df``; the years and
+    dates written are recorded in ``changes``. Raises on database errors; the caller owns the transaction.
+    """
+    inserts, updates = df, df.iloc[0:0]
+    if incremental and len(df) and needs_diff(df, "match_date", high_water_mark):
+        df = add_occurrence(df, MATCH_KEY)
+        dates = date_range(df, "match_date") if chunked else None
+        existing = add_occurrence(existing_frame(session, Match, MATCH_COLUMNS, dates), MATCH_KEY)
+        payload = [c for c in MATCH_COLUMNS if c not in MATCH_KEY]
+        inserts, updates = split_delta(df, existing, MATCH_UPSERT_KEY, payload, "match_date", high_water_mark)
+
+    bulk_insert(session, Match, to_records(inserts, MATCH_COLUMNS))
+    if len(updates):
+        bulk_update(session, Match, to_records(updates, ["id"] + MATCH_COLUMNS))
+    for rows in (inserts, updates):
+        if changes is not None and len(rows):
+            changes.years.update(int(year) for year in rows["match_date"].dt.year.unique())
+            changes.rating_dates.add(rows["match_date"].min().date())
+    return len(inserts), len(updates), []
+
+def load_goalscorers_frame(session, df, match_index=None, player_index=None, incremental=False,
+                           high_water_mark=None, chunked=False, columns=None, changes=None):
+    """Link, resolve players for, and write parsed goal rows. Returns ``(inserted, updated, rejected)``.
+
+    Without ``match_index``/``player_index`` they are built from the database,
+    limited to the dates and scorers in ``df`` when ``chunked``. Goals whose
+    match is unknown are returned as rejected, restricted to ``columns``.
+    """
+    if not len(df):
+        return 0, 0, []
+    if match_index is None:
+        match_index = build_match_index(session, date_range(df, "date") if chunked else None)
+    if player_index is None:
+        player_index = build_player_index(session, sorted(df["scorer"].unique()) if chunked else None)
+
+    df = link_match_ids(df, match_index, "date")
+    linked = df["match_id"].notna()
+    rejected = [df.loc[~linked, columns or list(df.columns)].assign(reason="no_match")]
+    df = df[linked]
+
+    df, created, reused = resolve_player_ids(session, df, player_index)
+    logging.info(f"Players resolved. Created: {created}, Reused: {reused}")
+
+    inserts, updates = df, df.iloc[0:0]
+    if incremental and len(df) and needs_diff(df, "date", high_water_mark):
+        base_key = GOAL_UPSERT_KEY[:-1]
+        df = add_occurrence(df.assign(minute=df["minute"].astype("float64")), base_key)
+        existing = existing_frame(session, Goal, GOAL_COLUMNS, date_range(df, "date") if chunked else None)
+        existing = add_occurrence(existing.assign(
+            minute=existing["minute"].astype("float64"),
+            own_goal=existing["own_goal"].astype(bool),
+            penalty=existing["penalty"].astype(bool)
+        ), base_key)
+        inserts, updates = split_delta(df, existing, GOAL_UPSERT_KEY, ["team_id"], "date", high_water_mark)
+
+    bulk_insert(session, Goal, to_records(inserts, GOAL_COLUMNS))
+    if len(updates):
+        bulk_update(session, Goal, to_records(updates, ["id", "team_id"]))
+    for rows in (inserts, updates):
+        if changes is not None:
+            changes.scorers.update(int(player_id) for player_id in rows["player_id"].unique())
+    return len(inserts), len(updates), rejected
+
+def load_shootouts_frame(session, df, match_index=None, incremental=False,
+                         high_water_mark=None, chunked=False, columns=None, changes=None):
+    """Link and write parsed shootout rows. Returns ``(inserted, updated, rejected)``."""
+    if not len(df):
+        return 0, 0, []
+    if match_index is None:
+        match_index = build_match_index(session, date_range(df, "match_date") if chunked else None)
+
+    df = link_match_ids(df, match_index, "match_date")
+    linked = df["match_id"].notna()
+    rejected = [df.loc[~linked, columns or list(df.columns)].assign(reason="no_match")]
+    df = df[linked]
+
+    inserts, updates = df, df.iloc[0:0]
+    if incremental and len(df) and needs_diff(df, "match_date", high_water_mark):
+        dates = date_range(df, "match_date") if chunked else None
+        existing = existing_frame(session, Shootout, SHOOTOUT_COLUMNS, dates)
+        payload = [c for c in SHOOTOUT_COLUMNS if c not in SHOOTOUT_UPSERT_KEY]
+        inserts, updates = split_delta(
+            df, existing, SHOOTOUT_UPSERT_KEY, payload, "match_date", high_water_mark
+        )
+
+    bulk_insert(session, Shootout, to_records(inserts, SHOOTOUT_COLUMNS))
+    if len(updates):
+        bulk_update(session, Shootout, to_records(updates, ["id"] + SHOOTOUT_COLUMNS))
+    for rows in (inserts, updates):
+        if changes is not None and len(rows):
+            changes.shootout_years.update(int(year) for year in rows["match_date"].dt.year.unique())
+            changes.rating_dates.add(rows["match_date"].min().date())
+    return len(inserts), len(updates), rejected
+
+FRAME_LOADERS = {
+    "matches": (load_matches_frame, "match_date"),
+    "goalscorers": (load_goalscorers_frame, "date"),
+    "shootouts": (load_shootouts_frame, "match_date"),
+}
+
+def write_parsed(kind, parsed, incremental=False, changes=None, **indexes):
+    """Write one parsed source in a single transaction. ``parsed`` is None when the source was skipped."""
+    if parsed is None:
+        return
+    loader, date_column = FRAME_LOADERS[kind]
+    session = SessionLocal()
+    try:
+        high_water_mark, checksum = source_state(session, parsed["path"])
+        with timed_stage(f"{kind}: write") as stage:
+            extra = {} if kind == "matches" else {"columns": parsed["columns"]}
+            inserted, updated, rejected = loader(
+                session, parsed["df"], incremental=incremental, high_water_mark=high_water_mark,
+                changes=changes, **extra, **indexes
+            )
+            save_etl_state(
+                session, os.path.basename(parsed["path"]), checksum,
+                parsed["df"][date_column].max(), parsed["rows"]
+            )
+            session.commit()
+            stage["rows"] = inserted + updated
+
+        write_quarantine(kind, [parsed["rejected"]] + rejected)
+        skipped = sum(len(r) for r in [parsed["rejected"]] + rejected)
+        logging.info(
+            f"{kind.capitalize()} loaded in bulk. Inserted: {inserted}, Updated: {updated}, Skipped: {skipped}"
+        )
+    except Exception as e:
+        session.rollback()
+        logging.error(f"Error bulk loading {kind}: {e}")
+    finally:
+        session.close()
+
+def write_matches(parsed, incremental=False, changes=None):
+    write_parsed("matches", parsed, incremental, changes)
+
+def write_goalscorers(parsed, match_index=None, player_index=None, incremental=False, changes=None):
+    write_parsed(
+        "goalscorers", parsed, incremental, changes, match_index=match_index, player_index=player_index
+    )
+
+def write_shootouts(parsed, match_index=None, incremental=False, changes=None):
+    write_parsed("shootouts", parsed, incremental, changes, match_index=match_index)
+
+def read_source(kind, path, incremental=False):
+    """Parse one source CSV in-process; None when incremental mode finds it unchanged."""
+    if incremental and not source_changed(path):
+        return None
+    resolver = load_name_index()
+    with timed_stage(f"{kind}: parse") as stage:
+        parsed = parse_source(kind, path, resolver)
+        stage["rows"] = parsed["rows"]
+    return parsed
+
+def bulk_load_matches(path, incremental=False, changes=None):
+    write_matches(read_source("matches", path, incremental), incremental, changes)
+
+def bulk_load_goalscorers(path, match_index=None, player_index=None, incremental=False, changes=None):
+    write_goalscorers(
+        read_source("goalscorers", path, incremental), match_index, player_index, incremental, changes
+    )
+
+def bulk_load_shootouts(path, match_index=None, incremental=False, changes=None):
+    write_shootouts(read_source("shootouts", path, incremental), match_index, incremental, changes)
+
+# === Streaming mode ===
+# Each CSV is read in date-aligned chunks that are transformed, linked and
+# committed one at a time, so memory is bounded by the chunk size rather
+# than by the size of the file.
+
+def read_date_chunks(path, chunk_size):
+    """Yield ``path`` in frames of about ``chunk_size`` rows, never splitting a date across frames.
+
+    Keeping each date whole lets a chunk be diffed against exactly the stored
+    rows of its date range. Assumes the file is sorted by date, as the source
+    CSVs are.
+    """
+    carry = None
+    for chunk in pd.read_csv(path, chunksize=chunk_size):
+        if carry is not None:
+            chunk = pd.concat([carry, chunk], ignore_index=True)
+        last_date = chunk["date"] == chunk["date"].iloc[-1]
+        carry = chunk[last_date]
+        if (~last_date).any():
+            yield chunk[~last_date]
+    if carry is not None and len(carry):
+        yield carry
+
+def write_chunk(kind, df, columns, incremental=False, high_water_mark=None, attempts=CHUNK_RETRIES + 1,
+                changes=None):
+    """Write one chunk in its own session and transaction. Returns ``(inserted, updated, rejected)``.
+
+    The chunk is tried ``attempts`` times. If it still fails it is split in
+    halves, recursively, so only the rows that cannot be written are
+    quarantined and the rest of the chunk is kept.
+    """
+    loader, _ = FRAME_LOADERS[kind]
+    extra = {} if kind == "matches" else {"columns": columns}
+    for attempt in range(attempts):
+        session = SessionLocal()
+        try:
+            result = loader(
+                session, df, incremental=incremental, high_water_mark=high_water_mark, chunked=True,
+                changes=changes, **extra
+            )
+            session.commit()
+            return result
+        except Exception as e:
+            session.rollback()
+            logging.warning(f"{kind}: chunk of {len(df)} rows failed (attempt {attempt + 1}/{attempts}): {e}")
+        finally:
+            session.close()
+
+    if len(df) == 1:
+        return 0, 0, [df[columns].assign(reason="write_error")]
+    middle = len(df) // 2
+    inserted, updated, rejected = 0, 0, []
+    for half in (df.iloc[:middle], df.iloc[middle:]):
+        half_inserted, half_updated, half_rejected = write_chunk(
+            kind, half, columns, incremental, high_water_mark, attempts=1, changes=changes
+        )
+        inserted, updated, rejected = inserted + half_inserted, updated + half_updated, rejected + half_rejected
+    return inserted, updated, rejected
+
+def stream_source(kind, path, chunk_size, incremental=False, changes=None):
+    """Load one source CSV ``chunk_size`` rows at a time, committing after every chunk.
+
+    Match and player lookups are built per chunk from the dates and names it
+    contains, and each chunk's session is closed once it commits.
+    """
+    if incremental and not source_changed(path):
+        return
+    session = SessionLocal()
+    try:
+        high_water_mark, checksum = source_state(session, path)
+    finally:
+        session.close()
+    resolver = load_name_index()
+    _, date_column = FRAME_LOADERS[kind]
+    if os.path.exists(quarantine_path(kind)):
+        os.remove(quarantine_path(kind))
+
+    rows, inserted, updated, skipped, latest = 0, 0, 0, 0, None
+    for number, raw in enumerate(read_date_chunks(path, chunk_size)):
+        with timed_stage(f"{kind}: chunk {number}") as stage:
+            df, unresolved = TRANSFORMS[kind](raw, resolver)
+            chunk_inserted, chunk_updated, rejected = write_chunk(
+                kind, df, list(raw.columns), incremental, high_water_mark, changes=changes
+            )
+            write_quarantine(kind, [unresolved] + rejected, append=True)
+            stage["rows"] = chunk_inserted + chunk_updated
+
+        rows += len(raw)
+        inserted += chunk_inserted
+        updated += chunk_updated
+        skipped += sum(len(r) for r in [unresolved] + rejected)
+        if len(df):
+            latest = df[date_column].max() if latest is None else max(latest, df[date_column].max())
+
+    session = SessionLocal()
+    try:
+        save_etl_state(session, os.path.basename(path), checksum, latest, rows)
+        session.commit()
+    finally:
+        session.close()
+    logging.info(
+        f"{kind.capitalize()} streamed. Inserted: {inserted}, Updated: {updated}, Skipped: {skipped}"
+    )
+
+# === Summary tables ===
+
+def refresh_aggregates(incremental=False, changes=None):
+    """Rebuild the summary tables once matches are loaded.
+
+    A full load rebuilds them entirely; an incremental one only the years
+    whose matches changed in this run's ``changes``.
+    """
+    changes = changes if changes is not None else RunChanges()
+    years = sorted(changes.years) if incremental else None
+    if incremental and not years:
+        logging.info("No match changes, summary tables are up to date")
+        return
+    session = SessionLocal()
+    try:
+        with timed_stage("country_year_stats") as stage:
+            stage["rows"] = refresh_country_year_stats(session, years)
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        logging.error(f"Error refreshing summary tables: {e}")
+    finally:
+        session.close()
+
+def refresh_head_to_head(incremental=False, changes=None):
+    """Rebuild the head-to-head pair summaries, and the country results added up
+    from them, once matches and shootouts are loaded.
+
+    An incremental run only rebuilds the pairs that met in years whose matches
+    or shootouts changed.
+    """
+    changes = changes if changes is not None else RunChanges()
+    years = sorted(changes.years | changes.shootout_years) if incremental else None
+    if incremental and not years:
+        logging.info("No match or shootout changes, head-to-head summaries are up to date")
+        return
+    session = SessionLocal()
+    try:
+        with timed_stage("pair_stats") as stage:
+            stage["rows"] = refresh_pair_stats(session, years)
+        with timed_stage("country_stats") as stage:
+            stage["rows"] = refresh_country_stats(session)
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        logging.error(f"Error refreshing head-to-head summaries: {e}")
+    finally:
+        session.close()
+
+def refresh_scorers(incremental=False, changes=None):
+    """Recount the goals per player, in total and per (year, tournament), once goals are loaded.
+
+    An incremental run only recounts the players it touched, and the
+    per-year counts of the years whose matches changed.
+    """
+    changes = changes if changes is not None else RunChanges()
+    if incremental and not changes.scorers and not changes.years:
+        logging.info("No goal changes, scorer totals are up to date")
+        return
+    players = sorted(changes.scorers) if incremental else None
+    years = sorted(changes.years) if incremental else None
+    session = SessionLocal()
+    try:
+        if players is None or players:
+            with timed_stage("scorer_stats") as stage:
+                stage["rows"] = refresh_scorer_stats(session, players)
+        with timed_stage("scorer_year_stats") as stage:
+            stage["rows"] = refresh_scorer_year_stats(session, players, years)
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        logging.error(f"Error refreshing scorer totals: {e}")
+    finally:
+        session.close()
+
+def refresh_ratings(incremental=False, changes=None):
+    """Recompute the Elo ratings once matches and shootouts are loaded.
+
+    A full load rates the whole history; an incremental one only the matches
+    from the earliest date written in this run (or the first unrated match).
+    """
+    since = min(changes.rating_dates) if changes and changes.rating_dates else None
+    session = SessionLocal()
+    try:
+        with timed_stage("team_ratings") as stage:
+            stage["rows"] = refresh_team_ratings(session, since=since, full=not incremental)
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        logging.error(f"Error refreshing team ratings: {e}")
+    finally:
+        session.close()
+
+def publish_data_version():
+    """Bump the data version so API caches and ETags computed before this load go stale."""
+    session = SessionLocal()
+    try:
+        version = bump_data_version(session)
+        logging.info(f"Data version is now {version}")
+    except Exception as e:
+        session.rollback()
+        logging.error(f"Error bumping the data version: {e}")
+    finally:
+        session.close()
+
+# === Stage scheduler ===
+
+def run_stages(stages, workers):
+    """Run a DAG of ``{name: (func, dependencies)}`` stages on ``workers`` threads.
+
+    Each stage starts as soon as all of its dependencies have finished and is
+    called with their results as keyword arguments. Returns the results and the
+    wall time of every stage.
+    """
+    results, timings = {}, {}
+    pending = dict(stages)
+
+    def timed(func, kwargs):
+        start = time.perf_counter()
+        result = func(**kwargs)
+        return result, time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        running = {}
+        while pending or running:
+            ready = [name for name, (_, deps) in pending.items() if all(d in results for d in deps)]
+            for name in ready:
+                func, deps = pending.pop(name)
+                running[pool.submit(timed, func, {d: results[d] for d in deps})] = name
+            if not running:
+                raise ValueError(f"Unsatisfiable stage dependencies: {sorted(pending)}")
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                results[name], timings[name] = future.result()
+    return results, timings
+
+def build_stages(data_dir, incremental, parse, changes):
+    """Return the ETL DAG. ``parse(kind, path, name_index)`` runs the CPU-bound parsing; the
+    writers record what they change in ``changes`` for the refreshes."""
+    def source(name):
+        return os.path.join(data_dir, name)
+
+    return {
+        "countries": (lambda: load_countries(source("countries.csv")), []),
+        "former_names": (lambda countries: load_former_names(source("former_names.csv")), ["countries"]),
+        "name_index": (lambda former_names: load_name_index(), ["former_names"]),
+        "parse_matches": (
+            lambda name_index: parse("matches", source("results.csv"), name_index), ["name_index"]
+        ),
+        "parse_goalscorers": (
+            lambda name_index: parse("goalscorers", source("goalscorers.csv"), name_index), ["name_index"]
+        ),
+        "parse_shootouts": (
+            lambda name_index: parse("shootouts", source("shootouts.csv"), name_index), ["name_index"]
+        ),
+        "matches": (
+            lambda parse_matches: write_matches(parse_matches, incremental, changes), ["parse_matches"]
+        ),
+        "match_index": (lambda matches: load_match_index(), ["matches"]),
+        "aggregates": (lambda matches: refresh_aggregates(incremental, changes), ["matches"]),
+        "ratings": (lambda matches, shootouts: refresh_ratings(incremental, changes), ["matches", "shootouts"]),
+        "head_to_head": (
+            lambda matches, shootouts: refresh_head_to_head(incremental, changes), ["matches", "shootouts"]
+        ),
+        "scorers": (lambda goalscorers: refresh_scorers(incremental, changes), ["goalscorers"]),
+        "goalscorers": (
+            lambda parse_goalscorers, match_index: write_goalscorers(
+                parse_goalscorers, match_index, incremental=incremental, changes=changes
+            ),
+            ["parse_goalscorers", "match_index"]
+        ),
+        "shootouts": (
+            lambda parse_shootouts, match_index: write_shootouts(
+                parse_shootouts, match_index, incremental=incremental, changes=changes
+            ),
+            ["parse_shootouts", "match_index"]
+        ),
+    }
+
+def build_stream_stages(data_dir, incremental, chunk_size, changes):
+    """Return the streaming ETL DAG: goals and shootouts stream once all matches are in."""
+    def source(name):
+        return os.path.join(data_dir, name)
+
+    return {
+        "countries": (lambda: load_countries(source("countries.csv")), []),
+        "former_names": (lambda countries: load_former_names(source("former_names.csv")), ["countries"]),
+        "matches": (
+            lambda former_names: stream_source("matches", source("results.csv"), chunk_size, incremental, changes),
+            ["former_names"]
+        ),
+        "aggregates": (lambda matches: refresh_aggregates(incremental, changes), ["matches"]),
+        "ratings": (lambda matches, shootouts: refresh_ratings(incremental, changes), ["matches", "shootouts"]),
+        "head_to_head": (
+            lambda matches, shootouts: refresh_head_to_head(incremental, changes), ["matches", "shootouts"]
+        ),
+        "scorers": (lambda goalscorers: refresh_scorers(incremental, changes), ["goalscorers"]),
+        "goalscorers": (
+            lambda matches: stream_source("goalscorers", source("goalscorers.csv"), chunk_size, incremental, changes),
+            ["matches"]
+        ),
+        "shootouts": (
+            lambda matches: stream_source("shootouts", source("shootouts.csv"), chunk_size, incremental, changes),
+            ["matches"]
+        ),
+    }
+
+def run_pipeline(data_dir, mode="bulk", workers=1, chunk_size=None):
+    """Run the ETL over the CSVs in ``data_dir`` and log the time spent in each stage.
+
+    With ``chunk_size`` the CSVs are streamed and committed in chunks of that many rows.
+    Returns the run's ``RunChanges`` (empty for row mode, which always refreshes everything).
+    """
+    start = time.perf_counter()
+    if mode == "row":
+        load_countries(os.path.join(data_dir, "countries.csv"))
+        load_former_names(os.path.join(data_dir, "former_names.csv"))
+        load_matches(os.path.join(data_dir, "results.csv"))
+        load_goalscorers(os.path.join(data_dir, "goalscorers.csv"))
+        load_shootouts(os.path.join(data_dir, "shootouts.csv"))
+        refresh_aggregates()
+        refresh_head_to_head()
+        refresh_scorers()
+        refresh_ratings()
+        publish_data_version()
+        logging.info(f"ETL finished in {time.perf_counter() - start:.2f}s")
+        return RunChanges()
+
+    incremental = mode == "incremental"
+    changes = RunChanges()
+    if chunk_size:
+        _, timings = run_stages(
+            build_stream_stages(data_dir, incremental, chunk_size, changes), workers=max(workers, 2)
+        )
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as processes:
+            def parse(kind, path, name_index):
+                if incremental and not source_changed(path):
+                    return None
+                return processes.submit(parse_source, kind, path, name_index).result()
+
+            # Writers share the engine's connection pool, one pooled connection per running stage
+            _, timings = run_stages(build_stages(data_dir, incremental, parse, changes), workers=max(workers, 2))
+
+    publish_data_version()
+    for name, elapsed in timings.items():
+        logging.info(f"Stage {name:<18} {elapsed:8.2f}s")
+    logging.info(f"ETL finished in {time.perf_counter() - start:.2f}s")
+    return changes
+
+base_path = os.path.join(os.path.dirname(__file__), "..", "csvfiles")
 base_path = os.path.abspath(base_path)
 
-load_countries(f"{base_path}/countries.csv")
-load_former_names(f"{base_path}/former_names.csv")
-load_matches(f"{base_path}/results.csv")
-load_goalscorers(f"{base_path}/goalscorers.csv")
-load_shootouts(f"{base_path}/shootouts.csv")
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load the football CSVs into the database.")
+    parser.add_argument("--data-dir", default=base_path, help="directory holding the source CSVs")
+    parser.add_argument(
+        "--mode", choices=["bulk", "incremental", "row"], default=os.getenv("ETL_MODE", "bulk"),
+        help="bulk: full vectorized load, incremental: only what changed since the last run, "
+             "row: the original per-row loaders"
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="parallel parsing workers")
+    parser.add_argument(
+        "--chunk-size", type=int, default=None,
+        help="stream the CSVs this many rows at a time, committing after each chunk"
+    )
+    args = parser.parse_args(argv)
+    run_pipeline(
+        os.path.abspath(args.data_dir), mode=args.mode, workers=max(args.workers, 1), chunk_size=args.chunk_size
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import os
+from dataclasses import dataclass
+
+import numpy as np
+from sqlalchemy import func, desc
+from sqlalchemy.orm import Session
+
+from app.cache import LRUCache, current_data_version
+from app.models import ScorerYearStat
+
+# Rankings kept per filter combination; each is a few arrays of the players who scored
+LEADERBOARD_CACHE_SIZE = int(os.getenv("LEADERBOARD_CACHE_SIZE", "64"))
+
+_rankings = LRUCache(max_entries=LEADERBOARD_CACHE_SIZE)
+
+
+@dataclass(frozen=True)
+class LeaderboardFilter:
+    country_id: int = None
+    tournament: str = None
+    year_from: int = None
+    year_to: int = None
+    exclude_penalties: bool = False
+    exclude_own_goals: bool = False
+
+
+class Ranking:
+    """A full leaderboard for one filter: players by goals (ties by player id), with competition ranks
+    (1, 2, 2, 4). Pages and a player's rank are array slices and dict lookups."""
+
+    def __init__(self, player_ids, goals):
+        self.player_ids = player_ids
+        self.goals = goals
+        # Sorted by goals descending, so the rank is one plus the number of players with more goals
+        self.ranks = np.searchsorted(-goals, -goals, side="left") + 1
+        self.positions = {int(pid): i for i, pid in enumerate(player_ids)}
+
+    def __len__(self):
+        return len(self.player_ids)
+
+    def page(self, offset, limit):
+        end = offset + limit
+        return list(zip(
+            self.ranks[offset:end].tolist(), self.player_ids[offset:end].tolist(), self.goals[offset:end].tolist()
+        ))
+
+    def rank_of(self, player_id):
+        """``(rank, goals)`` of one player, or None if they have no goals under this filter."""
+        i = self.positions.get(player_id)
+        return None if i is None else (int(self.ranks[i]), int(self.goals[i]))
+
+
+def compute_ranking(db: Session, filters: LeaderboardFilter):
+    """Sum the per-(year, tournament) goal counts of every player matching ``filters`` and rank them."""
+    goals = ScorerYearStat.goals
+    if filters.exclude_penalties:
+        goals = goals - ScorerYearStat.penalties
+    if filters.exclude_own_goals:
+        goals = goals - ScorerYearStat.own_goals
+    total = func.sum(goals).label("total")
+
+    query = db.query(ScorerYearStat.player_id, total)
+    if filters.country_id:
+        query = query.filter(ScorerYearStat.country_id == filters.country_id)
+    if filters.tournament:
+        query = query.filter(ScorerYearStat.tournament == filters.tournament)
+    if filters.year_from:
+        query = query.filter(ScorerYearStat.year >= filters.year_from)
+    if filters.year_to:
+        query = query.filter(ScorerYearStat.year <= filters.year_to)
+    rows = query.group_by(ScorerYearStat.player_id)\
+        .having(total > 0)\
+        .order_by(desc(total), ScorerYearStat.player_id).all()
+
+    return Ranking(
+        np.array([row.player_id for row in rows], dtype=np.int64),
+        np.array([row.total for row in rows], dtype=np.int64)
+    )
+
+
+def get_ranking(db: Session, filters: LeaderboardFilter):
+    """The ranking for ``filters``, computed once per data version and then served from memory."""
+    version = current_data_version()
+    if version is None:
+        return compute_ranking(db, filters)
+    key = (version, filters)
+    ranking = _rankings.get(key)
+    if ranking is None:
+        ranking = compute_ranking(db, filters)
+        _rankings.set(key, ranking)
+    return ranking
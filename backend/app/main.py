@@ -1,12 +1,18 @@
 from fastapi import FastAPI, Depends, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_db, ASYNC_DATABASE_URL
 from app.auth import authenticate_user, create_token
-from app.routers import countries, stats, players, years, matches
+from app.routers import countries, stats, players, years, matches, export, ratings, h2h, slices
 from app.crud import get_country_profile
+from app.metrics import render_metrics, RequestMetricsMiddleware
 import logging
+import os
+
+# "numpy" serves the stats, profile and top-scorer routes from an in-memory columnar copy of the data
+ANALYTICS_ENGINE = os.getenv("ANALYTICS_ENGINE", "sql")
 
 logging.basicConfig(level=logging.INFO)
 app = FastAPI(title="WhyBother API", version="1.0", debug=True)
@@ -17,12 +23,18 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Link", "ETag", "Server-Timing"],
 )
+app.add_middleware(RequestMetricsMiddleware)
 
 @app.get("/", tags=["Root"])
 def read_root():
     return {"message": "Welcome to the WhyBother API"}
 
+@app.get("/metrics", tags=["Root"], response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
 @app.post("/login")
 async def login(form_data: OAuth2PasswordRequestForm = Depends()):
     if not authenticate_user(form_data.username, form_data.password):
@@ -31,12 +43,26 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()):
     return {"access_token": token, "token_type": "bearer"}
 
 
+if ANALYTICS_ENGINE == "numpy":
+    from app.routers import columnar
+
+    # Included first so its routes take precedence over the SQL ones on the same paths
+    app.include_router(columnar.router)
+
 app.include_router(countries.router)
-app.include_router(stats.router)
+if ASYNC_DATABASE_URL:
+    from app.routers import stats_async
+    app.include_router(stats_async.router)
+else:
+    app.include_router(stats.router)
 app.include_router(players.router)
 app.include_router(players.scorer_router)
 app.include_router(years.router)
+app.include_router(slices.router)
 app.include_router(matches.router)
+app.include_router(export.router)
+app.include_router(ratings.router)
+app.include_router(h2h.router)
 
 
 @app.get("/debug/country/{id}")
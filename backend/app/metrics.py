@@ -0,0 +1,200 @@
+import os
+import time
+import logging
+import threading
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+from app.database import engine, async_engine, pool_status
+
+SLOW_REQUEST_MS = float(os.getenv("METRICS_SLOW_REQUEST_MS", "500"))
+QUERY_COUNT_THRESHOLD = int(os.getenv("METRICS_QUERY_THRESHOLD", "20"))
+# Distinct statements kept per request for the slow/high-query-count log line
+MAX_LOGGED_STATEMENTS = 50
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250, 1000)
+
+logger = logging.getLogger("app.metrics")
+
+
+# === Histograms ===
+
+class Histogram:
+    """Prometheus-style cumulative histogram with one series per label tuple."""
+
+    def __init__(self, name, description, labels, buckets):
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label_values, value):
+        with self._lock:
+            counts, total = self._series.get(label_values, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[bisect_left(self.buckets, value)] += 1
+            self._series[label_values] = (counts, total + value)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {key: (list(counts), total) for key, (counts, total) in self._series.items()}
+        for label_values, (counts, total) in sorted(series.items()):
+            labels = ",".join(f'{k}="{v}"' for k, v in zip(self.labels, label_values))
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            cumulative += counts[-1]
+            lines.append(f'{self.name}_bucket{{{labels},le="+Inf"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{labels}}} {total}")
+            lines.append(f"{self.name}_count{{{labels}}} {cumulative}")
+        return lines
+
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Request latency per route template",
+    ("method", "route", "status"), LATENCY_BUCKETS
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries", "SQL statements executed per request",
+    ("method", "route"), QUERY_COUNT_BUCKETS
+)
+REQUEST_DB_TIME = Histogram(
+    "http_request_db_duration_seconds", "Time spent in SQL statements per request",
+    ("method", "route"), LATENCY_BUCKETS
+)
+HISTOGRAMS = (REQUEST_LATENCY, REQUEST_QUERIES, REQUEST_DB_TIME)
+
+
+# === Per-request query tracking ===
+
+class QueryStats:
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        # statement -> [executions, seconds]; repeats of one statement are what an N+1 looks like
+        self.statements = {}
+
+
+# Set by the middleware for the duration of a request. Sync handlers run in a
+# threadpool that copies the context, so they see (and mutate) the same object.
+current_query_stats = ContextVar("current_query_stats", default=None)
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    stats = current_query_stats.get()
+    if stats is None:
+        return
+    stats.count += 1
+    stats.seconds += elapsed
+    entry = stats.statements.get(statement)
+    if entry is not None:
+        entry[0] += 1
+        entry[1] += elapsed
+    elif len(stats.statements) < MAX_LOGGED_STATEMENTS:
+        stats.statements[statement] = [1, elapsed]
+
+
+for _engine in filter(None, (engine, async_engine and async_engine.sync_engine)):
+    event.listen(_engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(_engine, "after_cursor_execute", after_cursor_execute)
+
+
+# === Middleware ===
+
+def route_template(scope):
+    """The matched route's path template (``/countries/{country_id}``) so series don't explode per id."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class RequestMetricsMiddleware:
+    """Times every HTTP request, counts its SQL statements, records both in the histograms
+    and reports them in a ``Server-Timing`` header.
+
+    Requests slower than ``METRICS_SLOW_REQUEST_MS`` or running more than ``METRICS_QUERY_THRESHOLD``
+    statements (the signature of an N+1 loop) are logged with their SQL.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        start = time.perf_counter()
+        status = {"code": 500}
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                timing = (
+                    f"app;dur={elapsed_ms:.1f}, "
+                    f'db;dur={stats.seconds * 1000:.1f};desc="{stats.count} queries"'
+                )
+                message["headers"] = list(message.get("headers", [])) + [(b"server-timing", timing.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_query_stats.reset(token)
+            self.record(scope, status["code"], time.perf_counter() - start, stats)
+
+    def record(self, scope, status, elapsed, stats):
+        method, route = scope["method"], route_template(scope)
+        REQUEST_LATENCY.observe((method, route, str(status)), elapsed)
+        REQUEST_QUERIES.observe((method, route), stats.count)
+        REQUEST_DB_TIME.observe((method, route), stats.seconds)
+
+        if elapsed * 1000 >= SLOW_REQUEST_MS or stats.count > QUERY_COUNT_THRESHOLD:
+            statements = "\n".join(
+                f"  {executions}x [{seconds * 1000:.1f}ms] {' '.join(statement.split())}"
+                for statement, (executions, seconds) in stats.statements.items()
+            )
+            logger.warning(
+                f"{method} {scope['path']} ({route}) took {elapsed * 1000:.0f}ms "
+                f"with {stats.count} queries ({stats.seconds * 1000:.0f}ms in the database):\n{statements}"
+            )
+
+
+# === Exposition ===
+
+# Prometheus text exposition for /metrics: (metric, type, help) per pool_status() key
+POOL_METRICS = {
+    "size": ("db_pool_size", "gauge", "Configured number of persistent connections"),
+    "checked_out": ("db_pool_checked_out", "gauge", "Connections currently checked out"),
+    "checked_in": ("db_pool_checked_in", "gauge", "Idle connections in the pool"),
+    "overflow": ("db_pool_overflow", "gauge", "Connections open beyond the pool size"),
+    "connects": ("db_pool_connects_total", "counter", "New DBAPI connections opened"),
+    "checkouts": ("db_pool_checkouts_total", "counter", "Connection checkouts"),
+    "checkins": ("db_pool_checkins_total", "counter", "Connection checkins"),
+    "invalidations": ("db_pool_invalidations_total", "counter", "Connections invalidated (e.g. found stale)"),
+    "timeouts": ("db_pool_checkout_timeouts_total", "counter", "Checkouts that gave up after DB_POOL_TIMEOUT"),
+    "wait_seconds": ("db_pool_checkout_wait_seconds_total", "counter", "Time spent waiting for a connection"),
+    "max_wait_seconds": ("db_pool_checkout_wait_seconds_max", "gauge", "Longest single checkout wait"),
+}
+
+
+def render_metrics():
+    lines = []
+    for key, value in pool_status().items():
+        name, kind, description = POOL_METRICS[key]
+        lines += [f"# HELP {name} {description}", f"# TYPE {name} {kind}", f"{name} {value}"]
+    for histogram in HISTOGRAMS:
+        lines += histogram.render()
+    return "\n".join(lines) + "\n"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, Date, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, Float, Date, DateTime, ForeignKey, UniqueConstraint, Index
 from app.database import Base
 from sqlalchemy.orm import relationship
 
@@ -37,6 +37,16 @@ class FormerName(Base):
 
 class Match(Base):
     __tablename__ = "matches"
+    __table_args__ = (
+        # Year/date-range filters and the ETL's (date, home, away) match lookup
+        Index("ix_matches_date_teams", "match_date", "home_team_id", "away_team_id"),
+        # A country's matches, optionally within a date range (OR of both sides)
+        Index("ix_matches_home_team_date", "home_team_id", "match_date"),
+        Index("ix_matches_away_team_date", "away_team_id", "match_date"),
+        # Keyset pagination of the match lists on (match_date, id), optionally per tournament
+        Index("ix_matches_date_id", "match_date", "id"),
+        Index("ix_matches_tournament_date_id", "tournament", "match_date", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     match_date = Column(Date, nullable=False)
@@ -61,6 +71,7 @@ class Match(Base):
 
 class Player(Base):
     __tablename__ = "players"
+    __table_args__ = (Index("ix_players_name_country", "name", "country_id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False)
@@ -72,6 +83,7 @@ class Player(Base):
 
 class Goal(Base):
     __tablename__ = "goalscorers"
+    __table_args__ = (Index("ix_goalscorers_player_match", "player_id", "match_id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     match_id = Column(Integer, ForeignKey("matches.id"), nullable=False)
@@ -104,3 +116,137 @@ class Shootout(Base):
     away_team = relationship("Country", foreign_keys=[away_team_id])
     winner = relationship("Country", foreign_keys=[winner_id])
     first_shooter = relationship("Country", foreign_keys=[first_shooter_id])
+
+
+class EtlState(Base):
+    __tablename__ = "etl_state"
+
+    id = Column(Integer, primary_key=True, index=True)
+    source = Column(String(100), unique=True, nullable=False)
+    checksum = Column(String(64), nullable=False)
+    high_water_mark = Column(Date)
+    row_count = Column(Integer)
+    loaded_at = Column(DateTime)
+
+
+class DataVersion(Base):
+    __tablename__ = "data_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime)
+
+
+class CountryYearStat(Base):
+    __tablename__ = "country_year_stats"
+    __table_args__ = (UniqueConstraint("country_id", "year", name="uq_country_year_stats_country_year"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    country_id = Column(Integer, ForeignKey("countries.id"), nullable=False)
+    year = Column(Integer, nullable=False, index=True)
+    matches = Column(Integer, nullable=False, default=0)
+    wins = Column(Integer, nullable=False, default=0)
+    draws = Column(Integer, nullable=False, default=0)
+    losses = Column(Integer, nullable=False, default=0)
+    goals_for = Column(Integer, nullable=False, default=0)
+    goals_against = Column(Integer, nullable=False, default=0)
+
+    country = relationship("Country")
+
+
+class TeamRating(Base):
+    __tablename__ = "team_ratings"
+    __table_args__ = (
+        UniqueConstraint("match_id", "country_id", name="uq_team_ratings_match_country"),
+        # A country's rating history, and its latest rating on or before a date
+        Index("ix_team_ratings_country_date", "country_id", "match_date", "id"),
+        # Every country's latest rating as of a date
+        Index("ix_team_ratings_date_country", "match_date", "country_id", "id"),
+    )
+
+    # Rows are appended in the order matches are rated, so a higher id is a later rating
+    id = Column(Integer, primary_key=True)
+    country_id = Column(Integer, ForeignKey("countries.id"), nullable=False)
+    match_id = Column(Integer, ForeignKey("matches.id"), nullable=False)
+    match_date = Column(Date, nullable=False)
+    opponent_id = Column(Integer, ForeignKey("countries.id"), nullable=False)
+    result = Column(Float, nullable=False)
+    rating_before = Column(Float, nullable=False)
+    rating_after = Column(Float, nullable=False)
+
+    country = relationship("Country", foreign_keys=[country_id])
+    opponent = relationship("Country", foreign_keys=[opponent_id])
+
+
+class PairStat(Base):
+    __tablename__ = "pair_stats"
+    __table_args__ = (UniqueConstraint("team_a_id", "team_b_id", name="uq_pair_stats_teams"),)
+
+    # Each pair is stored once, with team_a_id < team_b_id
+    id = Column(Integer, primary_key=True, index=True)
+    team_a_id = Column(Integer, ForeignKey("countries.id"), nullable=False)
+    team_b_id = Column(Integer, ForeignKey("countries.id"), nullable=False)
+    matches = Column(Integer, nullable=False, default=0)
+    team_a_wins = Column(Integer, nullable=False, default=0)
+    team_b_wins = Column(Integer, nullable=False, default=0)
+    draws = Column(Integer, nullable=False, default=0)
+    team_a_goals = Column(Integer, nullable=False, default=0)
+    team_b_goals = Column(Integer, nullable=False, default=0)
+    team_a_shootout_wins = Column(Integer, nullable=False, default=0)
+    team_b_shootout_wins = Column(Integer, nullable=False, default=0)
+    first_match = Column(Date)
+    last_match = Column(Date)
+
+    team_a = relationship("Country", foreign_keys=[team_a_id])
+    team_b = relationship("Country", foreign_keys=[team_b_id])
+
+
+class CountryStat(Base):
+    __tablename__ = "country_stats"
+
+    # All-time results per country, counting shootout winners as winners (the match_results rule)
+    country_id = Column(Integer, ForeignKey("countries.id"), primary_key=True)
+    matches_played = Column(Integer, nullable=False, default=0)
+    wins = Column(Integer, nullable=False, default=0)
+    draws = Column(Integer, nullable=False, default=0)
+    losses = Column(Integer, nullable=False, default=0)
+
+    country = relationship("Country")
+
+
+class ScorerStat(Base):
+    __tablename__ = "scorer_stats"
+    # Top scorers: ORDER BY total_goals DESC LIMIT n reads the end of this index
+    __table_args__ = (Index("ix_scorer_stats_goals", "total_goals", "player_id"),)
+
+    player_id = Column(Integer, ForeignKey("players.id"), primary_key=True)
+    country_id = Column(Integer, ForeignKey("countries.id"), nullable=False)
+    total_goals = Column(Integer, nullable=False, default=0)
+
+    player = relationship("Player")
+    country = relationship("Country")
+
+
+class ScorerYearStat(Base):
+    __tablename__ = "scorer_year_stats"
+    __table_args__ = (
+        UniqueConstraint("player_id", "year", "tournament", name="uq_scorer_year_stats_player_year_tournament"),
+        # Leaderboards filtered by year range, tournament or country
+        Index("ix_scorer_year_stats_year", "year"),
+        Index("ix_scorer_year_stats_tournament_year", "tournament", "year"),
+        Index("ix_scorer_year_stats_country_year", "country_id", "year"),
+    )
+
+    # Goals per player per (year, tournament). penalties and own_goals are disjoint parts of goals:
+    # a penalty that was also an own goal counts as an own goal.
+    id = Column(Integer, primary_key=True, index=True)
+    player_id = Column(Integer, ForeignKey("players.id"), nullable=False)
+    country_id = Column(Integer, ForeignKey("countries.id"), nullable=False)
+    year = Column(Integer, nullable=False)
+    tournament = Column(String(100))
+    goals = Column(Integer, nullable=False, default=0)
+    penalties = Column(Integer, nullable=False, default=0)
+    own_goals = Column(Integer, nullable=False, default=0)
+
+    player = relationship("Player")
+    country = relationship("Country")
@@ -0,0 +1,61 @@
+import base64
+import json
+from datetime import date
+
+from fastapi import HTTPException, Request, Response
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+
+def encode_cursor(values: dict) -> str:
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def match_cursor(row) -> str:
+    return encode_cursor({"date": row.match_date.isoformat(), "id": row.id})
+
+
+def decode_match_cursor(cursor: str):
+    """Return the ``(match_date, id)`` position encoded in a match cursor, or None."""
+    if not cursor:
+        return None
+    values = decode_cursor(cursor)
+    try:
+        return date.fromisoformat(values["date"]), int(values["id"])
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def decode_id_cursor(cursor: str):
+    if not cursor:
+        return None
+    values = decode_cursor(cursor)
+    try:
+        return int(values["id"])
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def paginate(rows, limit: int, cursor_for, request: Request, response: Response):
+    """Trim a ``limit + 1`` row fetch to ``limit`` and advertise the next page.
+
+    The next cursor goes in the ``X-Next-Cursor`` header and as a ``Link: rel="next"``
+    URL, so list bodies keep their shape.
+    """
+    rows = list(rows)
+    if len(rows) > limit:
+        rows = rows[:limit]
+        cursor = cursor_for(rows[-1])
+        response.headers["X-Next-Cursor"] = cursor
+        response.headers["Link"] = f'<{request.url.include_query_params(cursor=cursor)}>; rel="next"'
+    return rows
@@ -0,0 +1,157 @@
+import numpy as np
+import pandas as pd
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+
+from app.models import Match, Shootout, TeamRating
+
+# World Football Elo style ratings (eloratings.net): every country starts at
+# INITIAL_RATING and each match moves both teams by K * G * (result - expected).
+INITIAL_RATING = 1500.0
+HOME_ADVANTAGE = 100.0
+# A shootout leaves the match a draw on the scoresheet; the winner is credited this result instead of 0.5
+SHOOTOUT_RESULT = 0.75
+
+# K factor by tournament weight
+WORLD_CUP_K = 60
+CONTINENTAL_FINALS_K = 50
+QUALIFIER_K = 40
+OTHER_TOURNAMENT_K = 30
+FRIENDLY_K = 20
+
+CONTINENTAL_FINALS = {
+    "UEFA Euro", "Copa América", "African Cup of Nations", "AFC Asian Cup", "Gold Cup",
+    "CONCACAF Championship", "Oceania Nations Cup", "Confederations Cup",
+}
+
+
+def tournament_k(tournament):
+    if not tournament or tournament == "Friendly":
+        return FRIENDLY_K
+    if tournament == "FIFA World Cup":
+        return WORLD_CUP_K
+    if tournament in CONTINENTAL_FINALS:
+        return CONTINENTAL_FINALS_K
+    if "qualification" in tournament or "Nations League" in tournament:
+        return QUALIFIER_K
+    return OTHER_TOURNAMENT_K
+
+
+def goal_difference_multiplier(diff):
+    """1 for a draw or a one-goal win, 1.5 for two goals, (11 + n) / 8 beyond."""
+    diff = np.abs(diff)
+    return np.where(diff <= 1, 1.0, np.where(diff == 2, 1.5, (11 + diff) / 8))
+
+
+def first_unrated_date(db: Session):
+    """Date of the earliest ratable match without ratings, or None when all are rated."""
+    return db.query(func.min(Match.match_date))\
+        .outerjoin(TeamRating, TeamRating.match_id == Match.id)\
+        .filter(
+            TeamRating.id.is_(None), Match.home_score.isnot(None), Match.away_score.isnot(None),
+            Match.home_team_id != Match.away_team_id
+        ).scalar()
+
+
+def ratings_before(db: Session, start):
+    """Every country's latest rating from matches before ``start``."""
+    query = db.query(TeamRating.country_id, func.max(TeamRating.id).label("id"))
+    if start is not None:
+        query = query.filter(TeamRating.match_date < start)
+    latest = query.group_by(TeamRating.country_id).subquery()
+    rows = db.query(TeamRating.country_id, TeamRating.rating_after)\
+        .join(latest, TeamRating.id == latest.c.id).all()
+    return dict(rows)
+
+
+def matches_from(db: Session, start):
+    """Scored matches on or after ``start`` in rating order, with their shootout winner.
+
+    Matches whose two sides resolved to the same country say nothing about its strength and are left out.
+    """
+    query = select(
+        Match.id, Match.match_date, Match.home_team_id, Match.away_team_id, Match.home_score,
+        Match.away_score, Match.tournament, Match.neutral, Shootout.winner_id
+    ).outerjoin(Shootout, Shootout.match_id == Match.id)\
+     .where(Match.home_score.isnot(None), Match.away_score.isnot(None), Match.home_team_id != Match.away_team_id)\
+     .order_by(Match.match_date, Match.id)
+    if start is not None:
+        query = query.where(Match.match_date >= start)
+    return pd.read_sql(query, db.connection())
+
+
+def rate(matches, ratings):
+    """Run the Elo updates over ``matches`` (in order), starting from ``ratings`` (updated in place).
+
+    Returns the team_ratings rows, two per match. The per-match factors are
+    computed column-wise; only the rating chain itself is sequential.
+    """
+    home_score = matches["home_score"].to_numpy(np.int64)
+    away_score = matches["away_score"].to_numpy(np.int64)
+    home = matches["home_team_id"].to_numpy(np.int64)
+    away = matches["away_team_id"].to_numpy(np.int64)
+    winner = matches["winner_id"].fillna(0).to_numpy(np.int64)
+
+    result = np.where(home_score > away_score, 1.0, np.where(home_score < away_score, 0.0, 0.5))
+    shootout = (home_score == away_score) & (winner > 0)
+    result = np.where(shootout & (winner == home), SHOOTOUT_RESULT, result)
+    result = np.where(shootout & (winner == away), 1 - SHOOTOUT_RESULT, result)
+
+    k = matches["tournament"].map(tournament_k).to_numpy(np.float64)
+    k = k * goal_difference_multiplier(home_score - away_score)
+    advantage = np.where(matches["neutral"].fillna(False).astype(bool).to_numpy(), 0.0, HOME_ADVANTAGE)
+
+    before_home, before_away = np.empty(len(matches)), np.empty(len(matches))
+    change = np.empty(len(matches))
+    for i in range(len(matches)):
+        h = ratings.get(home[i], INITIAL_RATING)
+        a = ratings.get(away[i], INITIAL_RATING)
+        expected = 1 / (10 ** ((a - h - advantage[i]) / 400) + 1)
+        delta = k[i] * (result[i] - expected)
+        ratings[home[i]] = h + delta
+        ratings[away[i]] = a - delta
+        before_home[i], before_away[i], change[i] = h, a, delta
+
+    match_id = matches["id"].to_numpy(np.int64)
+    match_date = matches["match_date"].to_numpy()
+    # Home and away rows interleaved, so ids keep following the rating order
+    frame = pd.DataFrame({
+        "country_id": np.column_stack([home, away]).ravel(),
+        "match_id": np.repeat(match_id, 2),
+        "match_date": np.repeat(match_date, 2),
+        "opponent_id": np.column_stack([away, home]).ravel(),
+        "result": np.column_stack([result, 1 - result]).ravel(),
+        "rating_before": np.column_stack([before_home, before_away]).ravel(),
+        "rating_after": np.column_stack([before_home + change, before_away - change]).ravel(),
+    })
+    frame["match_date"] = pd.to_datetime(frame["match_date"]).dt.date
+    return frame.to_dict("records")
+
+
+def refresh_team_ratings(db: Session, since=None, full=False, chunk_size=5000):
+    """Bring ``team_ratings`` up to date and return the number of rows written.
+
+    Ratings depend on every earlier match, so everything from the earliest
+    changed date is recomputed: ``since`` (matches or shootouts the ETL just
+    wrote) or the first match without ratings, whichever is earlier. Ratings
+    before that date are kept and seed the computation. ``full`` recomputes
+    the whole history.
+    """
+    if full:
+        start = None
+    else:
+        candidates = [d for d in (since, first_unrated_date(db)) if d is not None]
+        if not candidates:
+            return 0
+        start = min(candidates)
+
+    delete = db.query(TeamRating)
+    if start is not None:
+        delete = delete.filter(TeamRating.match_date >= start)
+    delete.delete(synchronize_session=False)
+
+    ratings = ratings_before(db, start) if start is not None else {}
+    rows = rate(matches_from(db, start), ratings)
+    for offset in range(0, len(rows), chunk_size):
+        db.execute(TeamRating.__table__.insert(), rows[offset:offset + chunk_size])
+    return len(rows)
@@ -0,0 +1,244 @@
+import re
+import logging
+import unicodedata
+
+import numpy as np
+import pandas as pd
+from sqlalchemy.orm import Session
+
+from app.cache import LRUCache, current_data_version
+from app.models import Country, FormerName
+
+# Source spellings that are neither a country name nor a recorded former name
+TEAM_ALIASES = {
+    "england": "United Kingdom",
+    "wales": "United Kingdom",
+    "china pr": "China",
+    "dr congo": "Democratic Republic of the Congo",
+    "republic of ireland": "Ireland",
+    "german dr": "East Germany",
+    "zaïre": "Democratic Republic of the Congo",
+    "viet nam": "Vietnam",
+    "ivory coast": "Cote d'Ivoire",
+    "côte d’ivoire": "Cote d'Ivoire",
+    "palestine": "Palestinian Territory",
+    "north macedonia": "Macedonia",
+    "iran": "Iran",
+    "curacao": "Curacao",
+    "czech republic": "Czechia",
+    "reunion": "Réunion",
+    "são tomé and príncipe": "Sao Tome and Principe",
+    "timor-leste": "Timor Leste"
+}
+
+# Lowest trigram similarity at which an unknown name is taken for a known one. Spelling variants
+# ("St Kitts and Nevis" 0.71, "Argentinia" 0.62) clear it; different teams with a shared word
+# ("Nigeria"/"Niger" 0.56, "South Sudan"/"Sudan" 0.5, "Western Australia"/"Australia" 0.47) don't.
+MIN_SIMILARITY = 0.6
+
+# Lower bar for /countries/search, which lists candidates rather than picking one: typos
+# ("Brasil" 0.4, "Germny" 0.5) clear it, unrelated names sharing a letter pair or two
+# ("Ivory"/"Iran" 0.1, "Brasil"/"Brunei" 0.17) don't. Prefix matches are listed regardless.
+SEARCH_MIN_SIMILARITY = 0.3
+
+_APOSTROPHES = re.compile(r"['’`´]")
+_SEPARATORS = re.compile(r"[\W_]+")
+
+
+def normalize(name):
+    """Casefolded, accent-stripped, punctuation-free form of a name, or None if nothing is left.
+
+    "Côte d’Ivoire" and "Cote d'Ivoire" both become "cote divoire", "Timor-Leste" "timor leste".
+    """
+    if not isinstance(name, str):
+        return None
+    text = unicodedata.normalize("NFKD", name.casefold())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    text = _SEPARATORS.sub(" ", _APOSTROPHES.sub("", text)).strip()
+    return text or None
+
+
+def trigrams(key):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TeamResolver:
+    """Resolves team names to country ids through an index of normalized country names, aliases and
+    former names, with a trigram fallback for near-misses.
+
+    An alias always wins. A former name wins over a country of the same name on dates inside its
+    ``start_date``/``end_date`` period (open ends and unknown dates count as inside), and otherwise
+    still resolves when nothing else has that name. Plain dicts and arrays, so it pickles to the
+    ETL's parser processes.
+    """
+
+    def __init__(self, countries, former_names=(), aliases=TEAM_ALIASES):
+        self.names = {}
+        self.index = {}
+        self.labels = {}
+        by_key = {}
+        for country_id, name in sorted(countries):
+            self.names[country_id] = name
+            key = normalize(name)
+            if key:
+                by_key.setdefault(key, country_id)
+                self.labels.setdefault(key, name)
+
+        self.aliases = set()
+        for alias, target in aliases.items():
+            key, country_id = normalize(alias), by_key.get(normalize(target))
+            if key and country_id is not None:
+                self.index[key] = country_id
+                self.labels.setdefault(key, alias)
+                self.aliases.add(key)
+        for key, country_id in by_key.items():
+            self.index.setdefault(key, country_id)
+
+        periods = []
+        for former, country_id, start, end in former_names:
+            key = normalize(former)
+            if not key or country_id not in self.names or key in self.aliases:
+                continue
+            self.index.setdefault(key, country_id)
+            self.labels.setdefault(key, former)
+            periods.append((key, country_id, start, end))
+        self.periods = pd.DataFrame(periods, columns=["key", "period_id", "start", "end"])
+        self.periods["start"] = pd.to_datetime(self.periods["start"])
+        self.periods["end"] = pd.to_datetime(self.periods["end"])
+        self.dated = {}
+        for key, country_id, start, end in self.periods.itertuples(index=False):
+            self.dated.setdefault(key, []).append((country_id, start, end))
+
+        self.keys = list(self.index)
+        self.key_ids = np.array([self.index[k] for k in self.keys], dtype=np.int64)
+        self.key_sizes = np.empty(len(self.keys), dtype=np.int64)
+        postings = {}
+        for position, key in enumerate(self.keys):
+            grams = trigrams(key)
+            self.key_sizes[position] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(position)
+        self.postings = {gram: np.array(positions, dtype=np.int64) for gram, positions in postings.items()}
+
+    @classmethod
+    def load(cls, db: Session):
+        countries = db.query(Country.id, Country.name).all()
+        former_names = db.query(
+            FormerName.former_name, FormerName.country_id, FormerName.start_date, FormerName.end_date
+        ).order_by(FormerName.id).all()
+        return cls(countries, former_names)
+
+    def similarity(self, key):
+        """Trigram similarity (shared / union) of ``key`` against every index key."""
+        grams = trigrams(key)
+        hits = [self.postings[g] for g in grams if g in self.postings]
+        if not hits:
+            return np.zeros(len(self.keys))
+        shared = np.bincount(np.concatenate(hits), minlength=len(self.keys))
+        return shared / (len(grams) + self.key_sizes - shared)
+
+    def closest(self, key):
+        """The index key a near-miss stands for, or None when no key is similar enough or the most
+        similar keys belong to different countries."""
+        if not self.keys:
+            return None
+        scores = self.similarity(key)
+        best = scores.max()
+        if best < MIN_SIMILARITY:
+            return None
+        candidates = np.flatnonzero(scores == best)
+        if len(np.unique(self.key_ids[candidates])) > 1:
+            return None
+        return self.keys[candidates[0]]
+
+    def resolve(self, names, dates=None):
+        """Country ids for a column of names, NaN where unknown, aligned with ``names``.
+
+        Each distinct name is normalized (and matched by trigrams if need be) once; ``dates``,
+        when given, pick between a former name and a country of the same name row by row.
+        """
+        names = pd.Series(names)
+        keys = {name: normalize(name) for name in names.dropna().unique()}
+        fuzzy = {}
+        for name, key in keys.items():
+            if key and key not in self.index:
+                match = self.closest(key)
+                if match:
+                    keys[name] = fuzzy[name] = match
+        if fuzzy:
+            logging.info("Resolved by similarity: " + ", ".join(
+                f"'{name}' -> '{self.names[self.index[key]]}'" for name, key in fuzzy.items()
+            ))
+
+        key = names.map(keys)
+        ids = key.map(self.index).to_numpy(np.float64)
+        if len(self.periods):
+            dated = np.flatnonzero(key.isin(self.periods["key"]).to_numpy())
+            if len(dated):
+                rows = pd.DataFrame({
+                    "row": dated,
+                    "key": key.to_numpy()[dated],
+                    "date": pd.to_datetime(pd.Series(dates).to_numpy()[dated]) if dates is not None else pd.NaT
+                }).merge(self.periods, on="key")
+                inside = (
+                    rows["date"].isna()
+                    | ((rows["start"].isna() | (rows["start"] <= rows["date"]))
+                       & (rows["end"].isna() | (rows["date"] <= rows["end"])))
+                )
+                rows = rows[inside].drop_duplicates("row")
+                ids[rows["row"].to_numpy()] = rows["period_id"].to_numpy()
+        return pd.Series(ids, index=names.index)
+
+    def resolve_name(self, name, match_date=None):
+        """Country id of one name, or None. The same rules as ``resolve`` for the row-by-row loaders."""
+        key = normalize(name)
+        if key and key not in self.index:
+            key = self.closest(key)
+        if not key:
+            return None
+        when = None if match_date is None or pd.isna(match_date) else pd.Timestamp(match_date)
+        for country_id, start, end in self.dated.get(key, ()):
+            if when is None or ((start is pd.NaT or start <= when) and (end is pd.NaT or when <= end)):
+                return country_id
+        return self.index[key]
+
+    def search(self, query, limit=10):
+        """Countries whose name, former name or alias best matches ``query``: prefix matches first,
+        then by trigram similarity. One entry per country, with the name that matched."""
+        key = normalize(query)
+        if not key or not self.keys:
+            return []
+        scores = self.similarity(key)
+        prefix = np.array([k.startswith(key) or f" {key}" in f" {k}" for k in self.keys])
+        order = np.lexsort((self.key_ids, -scores, ~prefix))
+        results, seen = [], set()
+        for position in order:
+            country_id = int(self.key_ids[position])
+            if country_id in seen or not (prefix[position] or scores[position] >= SEARCH_MIN_SIMILARITY):
+                continue
+            seen.add(country_id)
+            results.append({
+                "id": country_id,
+                "name": self.names[country_id],
+                "matched": self.labels[self.keys[position]],
+                "score": round(float(scores[position]), 3)
+            })
+            if len(results) == limit:
+                break
+        return results
+
+
+_resolvers = LRUCache(max_entries=2)
+
+
+def get_resolver(db: Session):
+    """The resolver for the current data version, built once and then served from memory."""
+    version = current_data_version()
+    if version is None:
+        return TeamResolver.load(db)
+    resolver = _resolvers.get(version)
+    if resolver is None:
+        resolver = TeamResolver.load(db)
+        _resolvers.set(version, resolver)
+    return resolver
@@ -0,0 +1,120 @@
+from typing import Optional
+
+import numpy as np
+from fastapi import APIRouter, HTTPException
+
+from ..cache import CachedRoute
+from ..columnar import engine
+
+class StoreCachedRoute(CachedRoute):
+    """Caches under the version of the store answering the request, not the database's: between an
+    ETL run and the store's reload, responses from the old store must not be filed under the new version."""
+
+    def data_version(self):
+        store = engine.store
+        return store.version if store is not None else None
+
+
+# The analytics routes of stats.py, countries.py and players.py answered from the in-memory
+# columnar store. main.py mounts this router first when ANALYTICS_ENGINE=numpy, so these
+# paths shadow the SQL ones; the responses are the same. The store loads at startup and
+# reloads in the background whenever the ETL publishes a new data version.
+router = APIRouter(
+    tags=["Analytics"],
+    route_class=StoreCachedRoute,
+    on_startup=[engine.start],
+    on_shutdown=[engine.stop]
+)
+
+
+def _store():
+    if engine.store is None:
+        raise HTTPException(status_code=503, detail="Analytics are still loading")
+    return engine.store
+
+
+def _profile_stats(summary):
+    matches, wins, goals = summary["matches"], summary["wins"], summary["goals"]
+    return {
+        "matches": matches,
+        "wins": wins,
+        "goals": goals,
+        "points": 3 * wins + summary["draws"],
+        "avg_goals": round(goals / matches if matches else 0, 2)
+    }
+
+
+@router.get("/stats/global")
+async def get_global_stats():
+    store = _store()
+    matches, wins, goals = store.team_totals()
+    ids = np.array(sorted(store.countries), dtype=np.int64)
+    played = ids[matches[ids] > 0]
+    # Stable sorts, so ties keep country id order like the SQL route
+    by_wins = played[np.argsort(-wins[played], kind="stable")[:10]]
+    by_goals = played[np.argsort(-goals[played], kind="stable")[:10]]
+
+    return {
+        "top10_wins": [{"country": store.country_name[i], "wins": int(wins[i])} for i in by_wins],
+        "top10_goals": [{"country": store.country_name[i], "goals": int(goals[i])} for i in by_goals],
+        "population_scatter": [
+            {"country": store.country_name[i], "wins": int(wins[i]), "population": store.countries[i]["population"]}
+            for i in ids if store.countries[i]["population"]
+        ]
+    }
+
+
+@router.get("/stats/{year}")
+async def get_yearly_stats(year: int):
+    store = _store()
+    matches = store.year_matches(year)
+    return {
+        "year": year,
+        "total_matches": len(matches),
+        "top_teams": store.top_teams_by_goals(year),
+        "matches": matches
+    }
+
+
+@router.get("/stats/country/{country_id}/profile")
+async def get_stats_country_profile(country_id: int, from_year: Optional[int] = None, to_year: Optional[int] = None):
+    store = _store()
+    country = store.countries.get(country_id)
+    if not country:
+        raise HTTPException(status_code=404, detail="Country not found")
+
+    summary = store.country_summary(country_id, from_year, to_year)
+    return {
+        "country": country["name"],
+        "region": country["region"],
+        "population": country["population"],
+        "area": country["area_sq_km"],
+        "stats": _profile_stats(summary)
+    }
+
+
+@router.get("/countries/{country_id}/profile", tags=["Countries"])
+async def get_country_profile(country_id: int, from_year: Optional[int] = None, to_year: Optional[int] = None):
+    store = _store()
+    country = store.countries.get(country_id)
+    if not country:
+        raise HTTPException(status_code=404, detail="Country not found")
+
+    summary = store.country_summary(country_id, from_year, to_year)
+    return {
+        "country": country["name"],
+        "region": country["region"],
+        "continent": country["continent"],
+        "population": country["population"],
+        "area": country["area_sq_km"],
+        "stats": _profile_stats(summary),
+        "wins_per_year": summary["wins_per_year"]
+    }
+
+
+@router.get("/scorers/", tags=["Scorers"])
+async def get_top_scorers(limit: int = 10):
+    return [
+        {"player_id": pid, "players": name, "country": country, "total_goals": goals}
+        for pid, name, country, goals in _store().top_scorers(limit)
+    ]
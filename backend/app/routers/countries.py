@@ -1,17 +1,18 @@
 from datetime import date
 
-from fastapi import APIRouter, Depends, HTTPException
-from httptools.parser.parser import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from ..database import get_db
-from .. import crud, models
-from ..models import Country,Match
-from sqlalchemy import or_
+from ..cache import CachedRoute
+from .. import crud, models, resolver
+from ..models import Country
+from ..pagination import DEFAULT_LIMIT, MAX_LIMIT, decode_match_cursor, match_cursor, paginate
 
 router = APIRouter(
     prefix="/countries",
-    tags=["Countries"]
+    tags=["Countries"],
+    route_class=CachedRoute
 )
 
 @router.get("/", response_model=List[dict])
@@ -27,6 +28,16 @@ def get_countries(db: Session = Depends(get_db)):
         for c in countries
     ]
 
+# Declared before /{country_id} so "search" is not taken for an id
+@router.get("/search", response_model=List[dict])
+def search_countries(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db)
+):
+    """Countries matching ``q`` by name, former name or alias, tolerant of accents, punctuation and typos."""
+    return resolver.get_resolver(db).search(q, limit)
+
 @router.get("/{country_id}", response_model=dict)
 def get_country(country_id: int, db: Session = Depends(get_db)):
     country = crud.get_country_by_id(db, country_id)
@@ -54,34 +65,12 @@ def get_country_profile(
     if not country:
         raise HTTPException(status_code=404, detail="Country not found")
 
-    matches = db.query(Match).filter(
-        or_(
-            Match.home_team_id == country_id,
-            Match.away_team_id == country_id
-        )
-    )
-
-    if from_year:
-        matches = matches.filter(Match.match_date >= date(from_year, 1, 1))
-    if to_year:
-        matches = matches.filter(Match.match_date <= date(to_year, 12, 31))
-
-    matches = matches.all()
-    total_matches = len(matches)
-    wins = 0
-    goals = 0
-    points = 0
-
-    for match in matches:
-        is_home = match.home_team_id == country_id
-        scored = match.home_score if is_home else match.away_score
-        conceded = match.away_score if is_home else match.home_score
-        goals += scored
-        if scored > conceded:
-            wins += 1
-            points += 3
-        elif scored == conceded:
-            points += 1
+    # Totals and wins per year both come from one read of the per-year aggregates
+    year_stats = crud.get_country_year_stats(db, country_id, from_year, to_year)
+    total_matches = sum(row.matches for row in year_stats)
+    wins = sum(row.wins for row in year_stats)
+    goals = sum(row.goals_for for row in year_stats)
+    points = 3 * wins + sum(row.draws for row in year_stats)
 
     avg_goals = goals / total_matches if total_matches else 0
 
@@ -101,50 +90,47 @@ def get_country_profile(
 
 
     }
-    wins_by_year = {}
-    match_list = []
-
-    for match in matches:
-        year = match.match_date.year
-        is_home = match.home_team_id == country_id
-        scored = match.home_score if is_home else match.away_score
-        conceded = match.away_score if is_home else match.home_score
-
-        match_list.append({
-            "date": match.match_date.strftime("%Y-%m-%d"),
-            "opponent": match.away_team.name if is_home else match.home_team.name,
-            "venue": "Home" if is_home else "Away",
-            "score": f"{scored}-{conceded}",
-        })
-
-        if scored > conceded:
-            wins_by_year[year] = wins_by_year.get(year, 0) + 1
-
-    # Convert dict to list of dicts for frontend
-    wins_per_year = [{"year": y, "wins": w} for y, w in sorted(wins_by_year.items())]
+    # Convert per-year aggregates to list of dicts for frontend
+    wins_per_year = [
+        {"year": row.year, "wins": row.wins}
+        for row in year_stats if row.wins
+    ]
 
-    # Include in profile
+    # Include in profile; the match list is paged separately by /countries/{id}/matches
     profile["wins_per_year"] = wins_per_year
-    profile["matches"] = match_list
 
     return profile
 
 @router.get("/{country_id}/matches", response_model=List[Dict[str, Any]])
-def get_country_matches(country_id: int, db: Session = Depends(get_db)):
+def get_country_matches(
+    country_id: int,
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    cursor: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    tournament: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
 
     country = db.query(models.Country).filter_by(id=country_id).first()
     if not country:
         raise HTTPException(status_code=404, detail="Country not found")
 
-    matches = crud.get_matches_for_country(db, country_id=country_id)
+    rows = crud.get_matches_for_country_with_names(
+        db, country_id=country_id, after=decode_match_cursor(cursor), limit=limit,
+        date_from=date_from, date_to=date_to, tournament=tournament
+    )
+    matches = paginate(rows, limit, match_cursor, request, response)
     result = []
 
     for match in matches:
-        opponent_id = match.away_team_id if match.home_team_id == country_id else match.home_team_id
-        opponent = db.query(models.Country).filter_by(id=opponent_id).first()
+        opponent = match.away_team if match.home_team_id == country_id else match.home_team
         result.append({
+            "id": match.id,
             "match_date": match.match_date,
-            "opponent": opponent.name if opponent else "Unknown",
+            "opponent": opponent or "Unknown",
             "score": f"{match.home_score}-{match.away_score}",
             "home": match.home_team_id == country_id,
             "tournament": match.tournament,
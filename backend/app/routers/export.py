@@ -0,0 +1,94 @@
+import json
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+
+from .. import crud
+from ..database import SessionLocal
+
+router = APIRouter(
+    prefix="/export",
+    tags=["Export"]
+)
+
+EXPORT_BATCH_SIZE = 1000
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "json": "application/json",
+}
+
+
+def _encode(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def stream_rows(rows_for, fmt: str):
+    """Serialize rows as they come off the cursor, one write per batch.
+
+    The generator opens its own session: it keeps reading after the endpoint
+    has returned, so it cannot rely on the request-scoped ``get_db`` session.
+    """
+    db = SessionLocal()
+    try:
+        if fmt == "json":
+            yield "["
+        first = True
+        buffer = []
+        for row in rows_for(db):
+            line = json.dumps(dict(row._mapping), default=_encode)
+            if fmt == "json":
+                line = line if first else "," + line
+            else:
+                line += "\n"
+            first = False
+            buffer.append(line)
+            if len(buffer) >= EXPORT_BATCH_SIZE:
+                yield "".join(buffer)
+                buffer.clear()
+        if buffer:
+            yield "".join(buffer)
+        if fmt == "json":
+            yield "]"
+    finally:
+        db.close()
+
+
+def export_response(rows_for, fmt: str, name: str):
+    return StreamingResponse(
+        stream_rows(rows_for, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'}
+    )
+
+
+@router.get("/matches")
+def export_matches(
+    format: str = Query("ndjson", pattern="^(ndjson|json)$"),
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    tournament: Optional[str] = None,
+    team_id: Optional[int] = None
+):
+    return export_response(
+        lambda db: crud.stream_matches_with_names(
+            db, EXPORT_BATCH_SIZE,
+            date_from=date_from, date_to=date_to, tournament=tournament, team_id=team_id
+        ),
+        format, "matches"
+    )
+
+
+@router.get("/players")
+def export_players(
+    format: str = Query("ndjson", pattern="^(ndjson|json)$"),
+    country_id: Optional[int] = None
+):
+    return export_response(
+        lambda db: crud.stream_players_with_country(db, EXPORT_BATCH_SIZE, country_id=country_id),
+        format, "players"
+    )
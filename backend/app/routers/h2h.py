@@ -0,0 +1,75 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from .. import crud
+from ..database import get_db
+from ..cache import CachedRoute
+
+router = APIRouter(
+    prefix="/h2h",
+    tags=["Head to head"],
+    route_class=CachedRoute
+)
+
+
+def match_winner(match):
+    """Winning team id counting shootouts, None for a draw (the ``match_results`` view's rule)."""
+    if match.home_score is None or match.away_score is None:
+        return None
+    if match.home_score > match.away_score:
+        return match.home_team_id
+    if match.away_score > match.home_score:
+        return match.away_team_id
+    if match.shootout_winner_id in (match.home_team_id, match.away_team_id):
+        return match.shootout_winner_id
+    return None
+
+
+@router.get("/{team_a}/{team_b}")
+def get_head_to_head(
+    team_a: int,
+    team_b: int,
+    limit: int = Query(10, ge=0, le=100),
+    db: Session = Depends(get_db)
+):
+    if team_a == team_b:
+        raise HTTPException(status_code=400, detail="Pick two different countries")
+    country_a, country_b = crud.get_country_by_id(db, team_a), crud.get_country_by_id(db, team_b)
+    if not country_a or not country_b:
+        raise HTTPException(status_code=404, detail="Country not found")
+
+    pair = crud.get_pair_stats(db, team_a, team_b)
+    # The pair is stored lower id first; read its columns in the order of the request
+    a, b = ("b", "a") if team_a > team_b else ("a", "b")
+
+    def count(name, side):
+        return getattr(pair, f"team_{side}_{name}") if pair else 0
+
+    recent = crud.get_head_to_head_matches(db, team_a, team_b, limit) if limit else []
+    names = {team_a: country_a.name, team_b: country_b.name}
+    return {
+        "team_a": {"id": team_a, "name": country_a.name},
+        "team_b": {"id": team_b, "name": country_b.name},
+        "matches": pair.matches if pair else 0,
+        "team_a_wins": count("wins", a),
+        "team_b_wins": count("wins", b),
+        "draws": pair.draws if pair else 0,
+        "team_a_goals": count("goals", a),
+        "team_b_goals": count("goals", b),
+        "team_a_shootout_wins": count("shootout_wins", a),
+        "team_b_shootout_wins": count("shootout_wins", b),
+        "first_match": pair.first_match if pair else None,
+        "last_match": pair.last_match if pair else None,
+        "recent": [
+            {
+                "id": m.id,
+                "date": m.match_date,
+                "home": m.home_team,
+                "away": m.away_team,
+                "score": f"{m.home_score}-{m.away_score}",
+                "tournament": m.tournament,
+                "winner": names.get(match_winner(m))
+            }
+            for m in recent
+        ]
+    }
@@ -1,10 +1,12 @@
-from typing import List
+from datetime import date
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 
 from .. import crud
 from ..database import get_db
+from ..pagination import DEFAULT_LIMIT, MAX_LIMIT, decode_match_cursor, match_cursor, paginate
 
 router = APIRouter(
     prefix="/matches",
@@ -12,19 +14,33 @@ router = APIRouter(
 )
 
 @router.get("/", response_model=List[dict])
-def list_matches(db: Session = Depends(get_db)):
-    matches = crud.get_matches(db)
+def list_matches(
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    cursor: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    tournament: Optional[str] = None,
+    team_id: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    rows = crud.get_matches_with_names(
+        db, after=decode_match_cursor(cursor), limit=limit,
+        date_from=date_from, date_to=date_to, tournament=tournament, team_id=team_id
+    )
+    matches = paginate(rows, limit, match_cursor, request, response)
     return [
         {
             "id": m.id,
             "match_date": m.match_date,
-            "home_team": m.home_team.name if m.home_team else None,
-            "away_team": m.away_team.name if m.away_team else None,
+            "home_team": m.home_team,
+            "away_team": m.away_team,
             "home_score": m.home_score,
             "away_score": m.away_score,
             "tournament": m.tournament,
             "city": m.city,
-            "host_country": m.host_country.name if m.host_country else None,
+            "host_country": m.host_country,
             "neutral": m.neutral
         }
         for m in matches
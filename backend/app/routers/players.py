@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
 from ..database import get_db
+from ..cache import CachedRoute
 from ..models import Player, Country
 from .. import crud
+from ..leaderboard import LeaderboardFilter, get_ranking
+from ..pagination import DEFAULT_LIMIT, MAX_LIMIT, decode_id_cursor, encode_cursor, paginate
 from pydantic import BaseModel
 
 router = APIRouter(
@@ -23,19 +26,25 @@ class PlayerOut(BaseModel):
         orm_mode = True
 
 @router.get("/", response_model=List[PlayerOut])
-def list_players(country_id: Optional[int] = Query(None), db: Session = Depends(get_db)):
-    if country_id:
-        players = db.query(Player).filter(Player.country_id == country_id).all()
-    else:
-        players = crud.get_players(db)
-
+def list_players(
+    request: Request,
+    response: Response,
+    country_id: Optional[int] = Query(None),
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    rows = crud.get_players_with_country(
+        db, after=decode_id_cursor(cursor), limit=limit, country_id=country_id
+    )
+    players = paginate(rows, limit, lambda p: encode_cursor({"id": p.id}), request, response)
 
     return [
         PlayerOut(
             id=p.id,
             name=p.name,
             country_id=p.country_id,
-            country_name=p.country.name if p.country else None
+            country_name=p.country_name
         )
         for p in players
     ]
@@ -55,7 +64,7 @@ def get_player(player_id: int, db: Session = Depends(get_db)):
         country_name=player.country.name if player.country else None
     )
 
-scorer_router = APIRouter(prefix="/scorers", tags=["Scorers"])
+scorer_router = APIRouter(prefix="/scorers", tags=["Scorers"], route_class=CachedRoute)
 
 @scorer_router.get("/", response_model=List[dict])
 def get_top_scorers(limit: int = 10, db: Session = Depends(get_db)):
@@ -70,53 +79,84 @@ def get_top_scorers(limit: int = 10, db: Session = Depends(get_db)):
         for pid, name, country_name, total_goals in top_scorers
     ]
 
+@scorer_router.get("/leaderboard", response_model=dict)
+def get_scorer_leaderboard(
+    country_id: Optional[int] = None,
+    tournament: Optional[str] = None,
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+    exclude_penalties: bool = False,
+    exclude_own_goals: bool = False,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+    player_id: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """Ranked scorers under any combination of filters, a page at a time; ``player_id`` also returns that player's rank."""
+    ranking = get_ranking(db, LeaderboardFilter(
+        country_id, tournament, year_from, year_to, exclude_penalties, exclude_own_goals
+    ))
+    page = ranking.page(offset, limit)
+    players = crud.get_players_with_country_by_ids(
+        db, [pid for _, pid, _ in page] + ([player_id] if player_id else [])
+    )
+
+    def entry(rank, pid, goals):
+        player = players.get(pid)
+        return {
+            "rank": rank,
+            "player_id": pid,
+            "player": player.name if player else None,
+            "country": player.country_name if player else None,
+            "goals": goals
+        }
+
+    player_rank = ranking.rank_of(player_id) if player_id else None
+    return {
+        "total": len(ranking),
+        "offset": offset,
+        "limit": limit,
+        "items": [entry(*row) for row in page],
+        "player": entry(player_rank[0], player_id, player_rank[1]) if player_rank else None
+    }
+
 @scorer_router.get("/{player_id}", response_model=dict)
 def get_scorer_profile(player_id: int, db: Session = Depends(get_db)):
     player = crud.get_player_by_id(db, player_id)
     if not player:
         raise HTTPException(status_code=404, detail="Player not found")
-    goals = crud.get_goals_by_player(db, player_id)
-    total_goals = len(goals)
+    # One grouped query over the player's goals: goals per match, with the match year
+    goals_by_match = crud.get_player_goals_per_match(db, player_id)
+    total_goals = sum(row.goals for row in goals_by_match)
     # Max goals by players in a single match
-    goals_by_match = {}
-    for g in goals:
-        goals_by_match.setdefault(g.match_id, 0)
-        goals_by_match[g.match_id] += 1
-    max_goals_in_match = max(goals_by_match.values()) if goals_by_match else 0
+    max_goals_in_match = max((row.goals for row in goals_by_match), default=0)
+    goals_by_year = {}
+    for row in goals_by_match:
+        goals_by_year[int(row.year)] = goals_by_year.get(int(row.year), 0) + row.goals
     # Determine active years (first and last year with a goal)
-    years = [g.match.match_date.year for g in goals]
-    active_from = min(years) if years else None
-    active_to = max(years) if years else None
-    # Team goals per match overall (across active years)
+    active_from = min(goals_by_year) if goals_by_year else None
+    active_to = max(goals_by_year) if goals_by_year else None
+    # Team matches and goals per year come from the per-country, per-year aggregates
     country_id = player.country_id
-    team_matches = 0
-    team_goals = 0
-    if active_from and active_to:
-        for year in range(active_from, active_to + 1):
-            matches_year = crud.get_matches_by_year(db, year)
-            for match in matches_year:
-                if match.home_team_id == country_id or match.away_team_id == country_id:
-                    team_matches += 1
-                    team_goals += (match.home_score if match.home_team_id == country_id else match.away_score)
+    team_years = {}
+    if active_from and active_to and country_id:
+        team_years = {
+            row.year: row
+            for row in crud.get_country_year_stats(db, country_id, active_from, active_to)
+        }
+    # Team goals per match overall (across active years)
+    team_matches = sum(row.matches for row in team_years.values())
+    team_goals = sum(row.goals_for for row in team_years.values())
     team_gpm_overall = (team_goals / team_matches) if team_matches else None
     # Yearly performance stats for players and team
     yearly_stats = []
     if active_from and active_to:
         for year in range(active_from, active_to + 1):
-            # Player goals in that year
-            goals_in_year = sum(1 for g in goals if g.match.match_date.year == year)
-            # Team average goals per match in that year
-            matches_year = crud.get_matches_by_year(db, year)
-            team_matches_year = 0
-            team_goals_year = 0
-            for match in matches_year:
-                if match.home_team_id == country_id or match.away_team_id == country_id:
-                    team_matches_year += 1
-                    team_goals_year += (match.home_score if match.home_team_id == country_id else match.away_score)
-            team_gpm_year = (team_goals_year / team_matches_year) if team_matches_year else None
+            team_year = team_years.get(year)
+            team_gpm_year = (team_year.goals_for / team_year.matches) if team_year and team_year.matches else None
             yearly_stats.append({
                 "year": year,
-                "player_goals": goals_in_year,
+                "player_goals": goals_by_year.get(year, 0),
                 "team_goals_per_match": round(team_gpm_year, 2) if team_gpm_year is not None else None
             })
     return {
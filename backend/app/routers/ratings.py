@@ -0,0 +1,67 @@
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from .. import crud
+from ..database import get_db
+from ..cache import CachedRoute
+
+router = APIRouter(
+    prefix="/ratings",
+    tags=["Ratings"],
+    route_class=CachedRoute
+)
+
+
+@router.get("/")
+def get_ranking(
+    as_of: Optional[date] = None,
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db)
+):
+    """Elo ranking of the countries as it stood on ``as_of`` (default: latest)."""
+    ranking = crud.get_rating_ranking(db, as_of, limit)
+    return {
+        "as_of": as_of,
+        "ranking": [
+            {
+                "rank": rank,
+                "country_id": row.country_id,
+                "country": row.name,
+                "rating": round(row.rating, 1),
+                "last_match": row.last_match
+            }
+            for rank, row in enumerate(ranking, start=1)
+        ]
+    }
+
+
+@router.get("/{country_id}/history")
+def get_rating_history(
+    country_id: int,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    db: Session = Depends(get_db)
+):
+    country = crud.get_country_by_id(db, country_id)
+    if not country:
+        raise HTTPException(status_code=404, detail="Country not found")
+
+    history = crud.get_rating_history(db, country_id, date_from, date_to)
+    return {
+        "country": country.name,
+        "history": [
+            {
+                "date": row.match_date,
+                "match_id": row.match_id,
+                "opponent_id": row.opponent_id,
+                "opponent": row.opponent,
+                "result": row.result,
+                "rating": round(row.rating_after, 1),
+                "change": round(row.rating_after - row.rating_before, 1)
+            }
+            for row in history
+        ]
+    }
@@ -0,0 +1,38 @@
+from datetime import date
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from .. import slices
+from ..database import get_db
+from ..cache import CachedRoute
+
+router = APIRouter(
+    prefix="/slices",
+    tags=["Analytics"],
+    route_class=CachedRoute
+)
+
+
+@router.get("/")
+def get_slice_summary(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    tournament: Optional[List[str]] = Query(None),
+    neutral: Optional[bool] = None,
+    top: int = Query(5, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """Totals, top scoring teams and per-tournament counts of any matches: a date range, one or more
+    ``tournament`` values and ``neutral`` venue (or home) matches only, e.g. every World Cup match."""
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from is after date_to")
+    s = slices.Slice(date_from, date_to, tuple(sorted(set(tournament or ()))), neutral)
+    return {
+        "date_from": s.date_from,
+        "date_to": s.date_to,
+        "tournaments": list(s.tournaments),
+        "neutral": s.neutral,
+        **slices.summarize(db, s, top)
+    }
@@ -0,0 +1,80 @@
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException
+
+from .. import crud_async, slices
+from ..cache import CachedRoute
+
+# Same routes and responses as routers/stats.py, served on the async engine.
+# main.py mounts this router instead when ASYNC_DATABASE_URL is set.
+router = APIRouter(
+    prefix="/stats",
+    tags=["Analytics"],
+    route_class=CachedRoute
+)
+
+
+@router.get("/global")
+async def get_global_stats():
+    try:
+        top_wins, top_goals, population = await crud_async.gather(
+            (crud_async.get_top_countries, "wins"),
+            (crud_async.get_top_countries, "goals_for"),
+            (crud_async.get_population_wins,)
+        )
+
+        return {
+            "top10_wins": [{"country": name, "wins": int(wins)} for name, wins in top_wins],
+            "top10_goals": [{"country": name, "goals": int(goals)} for name, goals in top_goals],
+            "population_scatter": [
+                {"country": t.name, "wins": int(t.wins), "population": t.population}
+                for t in population
+            ]
+        }
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
+
+
+@router.get("/{year}")
+async def get_yearly_stats(year: int):
+    s = slices.Slice.for_year(year)
+    matches, top_teams = await crud_async.gather(
+        (crud_async.get_rows, slices.matches_query(s)),
+        (crud_async.get_rows, slices.top_teams_query(s))
+    )
+    return slices.year_stats(year, matches, top_teams)
+
+
+@router.get("/country/{country_id}/profile")
+async def get_country_profile(
+    country_id: int,
+    from_year: Optional[int] = None,
+    to_year: Optional[int] = None
+):
+    country, summary = await crud_async.gather(
+        (crud_async.get_country_by_id, country_id),
+        (crud_async.get_country_summary, country_id, from_year, to_year)
+    )
+    if not country:
+        raise HTTPException(status_code=404, detail="Country not found")
+
+    total_matches = int(summary.matches)
+    wins, goals = int(summary.wins), int(summary.goals_for)
+    points = 3 * wins + int(summary.draws)
+
+    avg_goals = goals / total_matches if total_matches else 0
+
+    return {
+        "country": country.name,
+        "region": country.region,
+        "population": country.population,
+        "area": country.area_sq_km,
+        "stats": {
+            "matches": total_matches,
+            "wins": wins,
+            "goals": goals,
+            "points": points,
+            "avg_goals": round(avg_goals, 2)
+        }
+    }
@@ -0,0 +1,140 @@
+from dataclasses import dataclass
+from datetime import date
+
+from sqlalchemy import select, func, case, desc, union_all
+from sqlalchemy.orm import Session, aliased
+
+from app.models import Country, Match
+
+
+@dataclass(frozen=True)
+class Slice:
+    """A set of matches: a date range (both ends inclusive), a set of tournaments and
+    neutral-venue or home matches only. Fields left unset don't filter."""
+    date_from: date = None
+    date_to: date = None
+    tournaments: tuple = ()
+    neutral: bool = None
+
+    @classmethod
+    def for_year(cls, year: int):
+        # A date range instead of YEAR(match_date) so the match_date index can be used
+        return cls(date_from=date(year, 1, 1), date_to=date(year, 12, 31))
+
+    def where(self, query):
+        if self.date_from:
+            query = query.where(Match.match_date >= self.date_from)
+        if self.date_to:
+            query = query.where(Match.match_date <= self.date_to)
+        if self.tournaments:
+            query = query.where(Match.tournament.in_(self.tournaments))
+        if self.neutral is not None:
+            query = query.where(Match.neutral == self.neutral)
+        return query
+
+
+# === Statements ===
+# Plain select() statements, so the async routes can run the same queries.
+
+def totals_query(s: Slice):
+    home, away = func.coalesce(Match.home_score, 0), func.coalesce(Match.away_score, 0)
+    return s.where(select(
+        func.count(Match.id).label("matches"),
+        func.coalesce(func.sum(home + away), 0).label("goals"),
+        func.coalesce(func.sum(case((Match.home_score > Match.away_score, 1), else_=0)), 0).label("home_wins"),
+        func.coalesce(func.sum(case((Match.home_score < Match.away_score, 1), else_=0)), 0).label("away_wins"),
+        func.coalesce(func.sum(case((Match.home_score == Match.away_score, 1), else_=0)), 0).label("draws")
+    ))
+
+
+def top_teams_query(s: Slice, limit: int = 5):
+    """Teams by goals scored in the slice (missing scores count as 0, as in ``country_year_stats``),
+    ties by country id, with their names."""
+    sides = union_all(
+        s.where(select(Match.home_team_id.label("country_id"), func.coalesce(Match.home_score, 0).label("goals"))),
+        s.where(select(Match.away_team_id.label("country_id"), func.coalesce(Match.away_score, 0).label("goals")))
+    ).subquery()
+    goals = func.sum(sides.c.goals)
+    return select(
+        sides.c.country_id,
+        Country.name.label("country"),
+        goals.label("goals"),
+        func.count().label("matches")
+    ).join(Country, Country.id == sides.c.country_id)\
+     .group_by(sides.c.country_id, Country.name)\
+     .order_by(desc(goals), sides.c.country_id)\
+     .limit(limit)
+
+
+def tournaments_query(s: Slice):
+    goals = func.coalesce(Match.home_score, 0) + func.coalesce(Match.away_score, 0)
+    matches = func.count(Match.id)
+    return s.where(select(
+        Match.tournament,
+        matches.label("matches"),
+        func.sum(goals).label("goals")
+    )).group_by(Match.tournament).order_by(desc(matches), Match.tournament)
+
+
+def matches_query(s: Slice):
+    """The slice's matches in (match_date, id) order with both team names joined in."""
+    home, away = aliased(Country), aliased(Country)
+    return s.where(select(
+        Match.id,
+        Match.match_date,
+        home.name.label("home_team"),
+        away.name.label("away_team"),
+        Match.home_score,
+        Match.away_score,
+        Match.tournament
+    ).outerjoin(home, Match.home_team_id == home.id)
+     .outerjoin(away, Match.away_team_id == away.id))\
+     .order_by(Match.match_date, Match.id)
+
+
+# === Responses ===
+
+def top_team_dict(row):
+    return {"country_id": row.country_id, "country": row.country, "goals": int(row.goals)}
+
+
+def match_dict(row):
+    return {
+        "date": row.match_date,
+        "home": row.home_team,
+        "away": row.away_team,
+        "score": f"{row.home_score}-{row.away_score}",
+        "tournament": row.tournament
+    }
+
+
+def year_stats(year: int, matches, top_teams):
+    """The ``/stats/{year}`` response from the rows of ``matches_query`` and ``top_teams_query``."""
+    return {
+        "year": year,
+        "total_matches": len(matches),
+        "top_teams": [top_team_dict(t) for t in top_teams],
+        "matches": [match_dict(m) for m in matches]
+    }
+
+
+def get_year_stats(db: Session, year: int):
+    s = Slice.for_year(year)
+    return year_stats(year, db.execute(matches_query(s)).all(), db.execute(top_teams_query(s)).all())
+
+
+def summarize(db: Session, s: Slice, top: int = 5):
+    """Totals, top scoring teams and per-tournament counts of a slice, aggregated in SQL."""
+    totals = db.execute(totals_query(s)).one()
+    return {
+        "total_matches": int(totals.matches),
+        "goals": int(totals.goals),
+        "home_wins": int(totals.home_wins),
+        "away_wins": int(totals.away_wins),
+        "draws": int(totals.draws),
+        "top_teams": [top_team_dict(t) for t in db.execute(top_teams_query(s, top))],
+        "tournaments": [
+            {"tournament": t.tournament, "matches": int(t.matches), "goals": int(t.goals)}
+            for t in db.execute(tournaments_query(s))
+        ]
+    }
@@ -21,7 +21,12 @@ def run_query(query_str):
 
 
 query = """
-        SELECT * FROM view_top_scorers LIMIT 10;
+        SELECT s.player_id, p.name AS player_name, c.name AS country_name, s.total_goals
+        FROM scorer_stats s
+        JOIN players p ON p.id = s.player_id
+        JOIN countries c ON c.id = s.country_id
+        ORDER BY s.total_goals DESC, s.player_id
+        LIMIT 10;
     """
 run_query(query)
 
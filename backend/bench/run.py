@@ -0,0 +1,331 @@
+"""Benchmark the ETL loaders and every GET endpoint on a synthetic dataset.
+
+For each scale it generates the CSVs (see bench.synthetic), loads them into a
+fresh database, times each loader, and then drives every GET route in the
+OpenAPI schema through an in-process client. It writes a JSON report with
+p50/p95 latency, throughput and peak memory:
+
+    python -m bench.run --scale 1 --scale 10 --out bench-report.json
+    python -m bench.run --scale 1 --baseline bench-report.json    # flag regressions
+
+The database is SQLite under --work-dir unless --database-url points elsewhere.
+Its tables are dropped and recreated, so only use a scratch MySQL database
+(and pass --reset to confirm).
+"""
+import os
+import re
+import sys
+import json
+import time
+import logging
+import argparse
+import platform
+import threading
+import subprocess
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+# Slower than this ratio against the baseline is reported as a regression
+REGRESSION_RATIO = 1.2
+
+
+# === Measurement ===
+
+def rss_bytes():
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class PeakMemory:
+    """Samples the process RSS in a background thread and keeps the peak seen inside the block."""
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.peak = 0
+
+    def __enter__(self):
+        self.peak = rss_bytes()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, rss_bytes())
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, rss_bytes())
+
+    @property
+    def peak_mb(self):
+        return round(self.peak / 2 ** 20, 1)
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * q))]
+
+
+# === One scale ===
+
+def count_rows(model):
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        return db.query(model).count()
+    finally:
+        db.close()
+
+
+def incremental_noop(etl, data_dir):
+    # run_pipeline tracks what it writes per run, so nothing from the bulk stages above carries over;
+    # an incremental run over the same files must write nothing, or the stage isn't timing a no-op
+    changes = etl.run_pipeline(data_dir, mode="incremental", workers=2)
+    if changes:
+        raise RuntimeError(f"incremental_noop changed data: {changes}")
+
+
+def time_etl(data_dir, rows):
+    from app import etl
+    from app.models import Match, Goal, Shootout
+
+    def path(name):
+        return os.path.join(data_dir, f"{name}.csv")
+
+    stages = [
+        ("countries", lambda: etl.load_countries(path("countries")), rows["countries"]),
+        ("former_names", lambda: etl.load_former_names(path("former_names")), rows["former_names"]),
+        ("matches", lambda: etl.bulk_load_matches(path("results")), rows["results"]),
+        ("goalscorers", lambda: etl.bulk_load_goalscorers(path("goalscorers")), rows["goalscorers"]),
+        ("shootouts", lambda: etl.bulk_load_shootouts(path("shootouts")), rows["shootouts"]),
+        ("ratings", lambda: etl.refresh_ratings(), rows["results"]),
+        ("aggregates", lambda: (etl.refresh_aggregates(), etl.publish_data_version()), rows["results"]),
+        # Every file unchanged: the cost of a no-op daily refresh
+        ("incremental_noop", lambda: incremental_noop(etl, data_dir), 0),
+    ]
+    # The bulk loaders log their failures instead of raising, so a broken one would only show as a
+    # fast stage; each must leave rows in its table
+    loaded_tables = {"matches": Match, "goalscorers": Goal, "shootouts": Shootout}
+    report = {}
+    for name, run, count in stages:
+        with PeakMemory() as memory:
+            start = time.perf_counter()
+            run()
+            seconds = time.perf_counter() - start
+        report[name] = {
+            "seconds": round(seconds, 3),
+            "rows": count,
+            "rows_per_sec": round(count / seconds, 1) if count and seconds else None,
+            "peak_rss_mb": memory.peak_mb,
+        }
+        if name in loaded_tables:
+            loaded = count_rows(loaded_tables[name])
+            report[name]["loaded"] = loaded
+            if count and not loaded:
+                raise RuntimeError(f"ETL stage {name} loaded none of its {count} source rows")
+        logging.info(f"ETL {name:<17} {seconds:8.2f}s  peak {memory.peak_mb} MB")
+    return report
+
+
+def sample_path_params():
+    """Values for the path parameters of the routes, taken from the loaded data."""
+    from app.database import SessionLocal
+    from app.models import Country, Match, Player, Goal
+
+    db = SessionLocal()
+    try:
+        country_ids = [cid for cid, in db.query(Match.home_team_id).group_by(Match.home_team_id).limit(2)]
+        match_id = db.query(Goal.match_id).order_by(Goal.match_id.desc()).limit(1).scalar()
+        player_id = db.query(Goal.player_id).order_by(Goal.player_id.desc()).limit(1).scalar()
+        year = db.query(Match.match_date).order_by(Match.match_date.desc()).limit(1).scalar().year - 10
+    finally:
+        db.close()
+    first = country_ids[0] if country_ids else None
+    second = country_ids[-1] if country_ids else None
+    return {
+        "country_id": first, "id": first, "a": first, "b": second, "team_a": first, "team_b": second,
+        "match_id": match_id, "player_id": player_id, "year": year,
+    }
+
+
+# Required query parameters, for the routes that have them
+QUERY_SAMPLES = {
+    "/countries/search": "q=united",
+}
+
+
+def get_endpoints(app):
+    """Every GET route in the OpenAPI schema, as path templates."""
+    return [
+        path for path, operations in sorted(app.openapi()["paths"].items())
+        if "get" in operations
+    ]
+
+
+def time_endpoints(requests):
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    params = sample_path_params()
+    client = TestClient(app)
+    report = {}
+    for template in get_endpoints(app):
+        names = re.findall(r"{(\w+)}", template)
+        if any(params.get(name) is None for name in names):
+            report[template] = {"skipped": f"no sample value for {names}"}
+            continue
+        url = template.format(**{name: params[name] for name in names})
+        if template in QUERY_SAMPLES:
+            url = f"{url}?{QUERY_SAMPLES[template]}"
+
+        latencies, statuses = [], set()
+        client.get(url)  # warm-up: imports, first connection, lazy engines
+        with PeakMemory() as memory:
+            start = time.perf_counter()
+            for _ in range(requests):
+                t = time.perf_counter()
+                response = client.get(url)
+                latencies.append(time.perf_counter() - t)
+                statuses.add(response.status_code)
+            total = time.perf_counter() - start
+        latencies.sort()
+        report[template] = {
+            "url": url,
+            "status": sorted(statuses),
+            "requests": requests,
+            "p50_ms": round(percentile(latencies, 0.5) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+            "rps": round(requests / total, 1),
+            "peak_rss_mb": memory.peak_mb,
+        }
+        logging.info(f"GET {url:<40} p50 {report[template]['p50_ms']:8.2f}ms  p95 {report[template]['p95_ms']:8.2f}ms")
+    return report
+
+
+def run_scale(args):
+    """Benchmark one scale in this process; app.database reads DATABASE_URL at import, so this runs
+    in a fresh interpreter per scale."""
+    from bench.synthetic import generate
+
+    scale = args.scale[0]
+    data_dir = os.path.join(args.work_dir, f"x{scale:g}")
+    rows = generate(data_dir, scale, args.seed)
+
+    from app.database import Base, engine
+    import app.models  # noqa: F401 - registers the tables on Base
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    for noisy in ("app.metrics", "httpx", "httpx2"):
+        logging.getLogger(noisy).setLevel(logging.ERROR)
+    report = {
+        "scale": scale,
+        "rows": rows,
+        "etl": time_etl(data_dir, rows),
+        "endpoints": time_endpoints(args.requests),
+    }
+    with open(args.scale_out, "w") as out:
+        json.dump(report, out, indent=2)
+
+
+# === Report ===
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report, baseline):
+    """Lines for every ETL stage or endpoint that got slower than REGRESSION_RATIO times the baseline."""
+    regressions = []
+    old_scales = {scale["scale"]: scale for scale in baseline.get("scales", [])}
+    for scale in report["scales"]:
+        old = old_scales.get(scale["scale"])
+        if not old:
+            continue
+        checks = [(f"etl {name}", stage.get("seconds"), old["etl"].get(name, {}).get("seconds"))
+                  for name, stage in scale["etl"].items()]
+        checks += [(f"GET {path} p95", result.get("p95_ms"), old["endpoints"].get(path, {}).get("p95_ms"))
+                   for path, result in scale["endpoints"].items()]
+        for name, new, before in checks:
+            if new and before and new > before * REGRESSION_RATIO:
+                regressions.append(f"x{scale['scale']:g} {name}: {before} -> {new} ({new / before:.2f}x)")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the ETL and the API on synthetic data.")
+    parser.add_argument("--scale", type=float, action="append", help="dataset scale, repeatable (default 1)")
+    parser.add_argument("--database-url", help="database to benchmark against (default: SQLite in --work-dir)")
+    parser.add_argument("--reset", action="store_true", help="allow dropping the tables of a non-SQLite database")
+    parser.add_argument("--work-dir", default=os.path.join(BENCH_DIR, ".data"))
+    parser.add_argument("--requests", type=int, default=30, help="requests per endpoint")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="bench-report.json")
+    parser.add_argument("--baseline", help="earlier report to compare against")
+    parser.add_argument("--scale-out", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s: %(message)s")
+
+    if args.scale_out:
+        return run_scale(args)
+
+    if args.database_url and not args.database_url.startswith("sqlite") and not args.reset:
+        parser.error("--database-url is not SQLite: pass --reset to confirm its tables may be dropped")
+
+    os.makedirs(args.work_dir, exist_ok=True)
+    report = {
+        "commit": git_commit(),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "scales": [],
+    }
+    for scale in args.scale or [1]:
+        database_url = args.database_url or f"sqlite:///{os.path.join(args.work_dir, f'bench-x{scale:g}.db')}"
+        scale_out = os.path.join(args.work_dir, f"report-x{scale:g}.json")
+        env = {
+            **os.environ,
+            "DATABASE_URL": database_url,
+            "CACHE_BACKEND": "none",
+            "ETL_QUARANTINE_DIR": os.path.join(args.work_dir, "quarantine"),
+        }
+        env.pop("ASYNC_DATABASE_URL", None)
+        if database_url.startswith("sqlite:///") and os.path.exists(database_url[len("sqlite:///"):]):
+            os.remove(database_url[len("sqlite:///"):])
+        subprocess.run(
+            [sys.executable, "-m", "bench.run", "--scale", f"{scale:g}", "--seed", str(args.seed),
+             "--work-dir", args.work_dir, "--requests", str(args.requests), "--scale-out", scale_out],
+            env=env, cwd=BACKEND_DIR, check=True
+        )
+        with open(scale_out) as result:
+            scale_report = json.load(result)
+        scale_report["database"] = database_url.split("://")[0]
+        report["scales"].append(scale_report)
+
+    with open(args.out, "w") as out:
+        json.dump(report, out, indent=2)
+    logging.info(f"Report written to {args.out}")
+
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            regressions = compare(report, json.load(baseline))
+        for line in regressions:
+            logging.warning(f"Regression: {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Synthetic football CSVs in the shape of the real ones, at a chosen scale.
+
+Scale 1 is about the size of the shipped results.csv (~48k matches); the
+goalscorers and shootouts files grow with it. Output is deterministic for a
+given seed:
+
+    python -m bench.synthetic --scale 10 --out bench/.data/x10
+"""
+import os
+import argparse
+
+import numpy as np
+import pandas as pd
+
+BASE_MATCHES = 48_000
+TEAMS = 300
+PLAYERS_PER_TEAM = 60
+# Share of matches with goalscorer rows (the real file starts in 1916 and has gaps)
+SCORED_MATCH_SHARE = 0.45
+SHOOTOUT_DRAW_SHARE = 0.06
+FIRST_DATE, LAST_DATE = pd.Timestamp("1872-11-30"), pd.Timestamp("2024-12-31")
+TOURNAMENTS = [
+    "Friendly", "FIFA World Cup qualification", "UEFA Euro qualification", "FIFA World Cup",
+    "African Cup of Nations qualification", "Copa América", "AFC Asian Cup qualification", "Nations League",
+]
+REGIONS = ["Africa", "Americas", "Asia", "Europe", "Oceania"]
+
+
+def team_names():
+    return np.array([f"Team {i:03d}" for i in range(TEAMS)])
+
+
+def former_names(teams):
+    """A few renamed teams; their old names appear in matches before ``end_date``."""
+    renamed = teams[:TEAMS // 20]
+    return pd.DataFrame({
+        "current": renamed,
+        "former": [f"Old {name}" for name in renamed],
+        "start_date": "1900-01-01",
+        "end_date": "1960-12-31",
+    })
+
+
+def countries(teams, rng):
+    return pd.DataFrame({
+        "Display_Name": teams,
+        "Region": rng.choice(REGIONS, len(teams)),
+        "Sub-Region": rng.choice(REGIONS, len(teams)),
+        "Status": "Independent",
+        "Developed": rng.choice(["Developed", "Developing"], len(teams)),
+        "Population": rng.integers(50_000, 200_000_000, len(teams)),
+        "Area": rng.integers(100, 10_000_000, len(teams)),
+    })
+
+
+def results(teams, renames, n, rng):
+    days = (LAST_DATE - FIRST_DATE).days
+    home = rng.integers(0, len(teams), n)
+    away = (home + rng.integers(1, len(teams), n)) % len(teams)
+    df = pd.DataFrame({
+        "date": FIRST_DATE + pd.to_timedelta(rng.integers(0, days, n), unit="D"),
+        "home_team": teams[home],
+        "away_team": teams[away],
+        "home_score": rng.poisson(1.6, n),
+        "away_score": rng.poisson(1.1, n),
+        "tournament": rng.choice(TOURNAMENTS, n, p=[0.4, 0.2, 0.1, 0.05, 0.1, 0.05, 0.05, 0.05]),
+    })
+    df = df.drop_duplicates(["date", "home_team", "away_team"]).sort_values("date", kind="stable")
+    df["city"] = "City of " + df["home_team"]
+    df["country"] = df["home_team"]
+    df["neutral"] = np.where(rng.random(len(df)) < 0.25, "TRUE", "FALSE")
+
+    # Renamed teams played under their former name until it was retired
+    old = dict(zip(renames["current"], renames["former"]))
+    before = df["date"] <= pd.Timestamp(renames["end_date"].iloc[0])
+    for column in ["home_team", "away_team", "country"]:
+        mask = before & df[column].isin(old.keys())
+        df.loc[mask, column] = df.loc[mask, column].map(old)
+    df["date"] = df["date"].dt.strftime("%Y-%m-%d")
+    return df.reset_index(drop=True)
+
+
+def goalscorers(matches, rng):
+    scored = matches[rng.random(len(matches)) < SCORED_MATCH_SHARE]
+    frames = []
+    for side, score in [("home_team", "home_score"), ("away_team", "away_score")]:
+        rows = scored.loc[scored.index.repeat(scored[score])]
+        frames.append(pd.DataFrame({
+            "date": rows["date"].to_numpy(),
+            "home_team": rows["home_team"].to_numpy(),
+            "away_team": rows["away_team"].to_numpy(),
+            "team": rows[side].to_numpy(),
+        }))
+    df = pd.concat(frames, ignore_index=True)
+    n = len(df)
+    df["scorer"] = df["team"].str.replace("Old ", "", regex=False) + " Player " + rng.integers(
+        0, PLAYERS_PER_TEAM, n).astype(str)
+    df["minute"] = rng.integers(1, 91, n)
+    df["own_goal"] = np.where(rng.random(n) < 0.02, "TRUE", "FALSE")
+    df["penalty"] = np.where(rng.random(n) < 0.08, "TRUE", "FALSE")
+    return df.sort_values("date", kind="stable").reset_index(drop=True)
+
+
+def shootouts(matches, rng):
+    draws = matches[(matches["home_score"] == matches["away_score"]) & (matches["tournament"] != "Friendly")]
+    df = draws[rng.random(len(draws)) < SHOOTOUT_DRAW_SHARE][["date", "home_team", "away_team"]].copy()
+    home_wins = rng.random(len(df)) < 0.5
+    df["winner"] = np.where(home_wins, df["home_team"], df["away_team"])
+    df["first_shooter"] = np.where(rng.random(len(df)) < 0.5, df["home_team"], df["away_team"])
+    return df.reset_index(drop=True)
+
+
+def generate(out_dir, scale=1, seed=0):
+    """Write countries, former_names, results, goalscorers and shootouts CSVs; return their row counts."""
+    rng = np.random.default_rng(seed)
+    os.makedirs(out_dir, exist_ok=True)
+    teams = team_names()
+    renames = former_names(teams)
+    matches = results(teams, renames, int(BASE_MATCHES * scale), rng)
+    frames = {
+        "countries": countries(teams, rng),
+        "former_names": renames,
+        "results": matches,
+        "goalscorers": goalscorers(matches, rng),
+        "shootouts": shootouts(matches, rng),
+    }
+    for name, df in frames.items():
+        df.to_csv(os.path.join(out_dir, f"{name}.csv"), index=False)
+    return {name: len(df) for name, df in frames.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic football CSVs.")
+    parser.add_argument("--scale", type=float, default=1, help="multiple of the ~48k matches in results.csv")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", required=True, help="output directory")
+    args = parser.parse_args(argv)
+    for name, rows in generate(args.out, args.scale, args.seed).items():
+        print(f"{name:<13} {rows:>10} rows")
+
+
+if __name__ == "__main__":
+    main()
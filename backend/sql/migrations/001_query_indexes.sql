@@ -0,0 +1,19 @@
+-- Secondary indexes for the API's and the ETL's hot query shapes.
+-- Apply once to databases created before these indexes were added to schema.sql:
+--   mysql -u root -p whybother < sql/migrations/001_query_indexes.sql
+USE whybother;
+
+-- /years/{year}, /stats/{year}: match_date range scans (prefix of the index).
+-- ETL: linking goals and shootouts to matches on (match_date, home_team_id, away_team_id).
+CREATE INDEX ix_matches_date_teams ON matches (match_date, home_team_id, away_team_id);
+
+-- /countries/{id}/matches and the country profiles: home_team_id = ? OR away_team_id = ?,
+-- optionally bounded by match_date; MySQL answers the OR with an index_merge union.
+CREATE INDEX ix_matches_home_team_date ON matches (home_team_id, match_date);
+CREATE INDEX ix_matches_away_team_date ON matches (away_team_id, match_date);
+
+-- /scorers/{player_id}: a player's goals and the matches they were scored in.
+CREATE INDEX ix_goalscorers_player_match ON goalscorers (player_id, match_id);
+
+-- ETL: looking up a scorer by (name, country_id).
+CREATE INDEX ix_players_name_country ON players (name, country_id);
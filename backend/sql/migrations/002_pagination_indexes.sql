@@ -0,0 +1,10 @@
+-- Indexes for keyset pagination of /matches/ and /countries/{id}/matches.
+-- Apply once to databases created before these indexes were added to schema.sql:
+--   mysql -u root -p whybother < sql/migrations/002_pagination_indexes.sql
+USE whybother;
+
+-- ORDER BY match_date, id with WHERE (match_date, id) > cursor: an index seek, then LIMIT rows read.
+CREATE INDEX ix_matches_date_id ON matches (match_date, id);
+
+-- The same page order restricted to one tournament (?tournament=...).
+CREATE INDEX ix_matches_tournament_date_id ON matches (tournament, match_date, id);
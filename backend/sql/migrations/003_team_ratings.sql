@@ -0,0 +1,24 @@
+-- Per-match Elo ratings of every country, filled by the ETL (app/ratings.py).
+-- Apply once to databases created before this table was added to schema.sql:
+--   mysql -u root -p whybother < sql/migrations/003_team_ratings.sql
+-- then run the ETL once to rate the full match history.
+USE whybother;
+
+CREATE TABLE team_ratings (
+    id             INT AUTO_INCREMENT PRIMARY KEY,
+    country_id     INT NOT NULL,
+    match_id       INT NOT NULL,
+    match_date     DATE NOT NULL,
+    opponent_id    INT NOT NULL,
+    result         DOUBLE NOT NULL,
+    rating_before  DOUBLE NOT NULL,
+    rating_after   DOUBLE NOT NULL,
+    UNIQUE KEY uq_team_ratings_match_country (match_id, country_id),
+    -- /ratings/{country_id}/history
+    INDEX ix_team_ratings_country_date (country_id, match_date, id),
+    -- /ratings/?as_of=...: the latest row per country on or before a date
+    INDEX ix_team_ratings_date_country (match_date, country_id, id),
+    FOREIGN KEY (country_id) REFERENCES countries(id),
+    FOREIGN KEY (match_id) REFERENCES matches(id),
+    FOREIGN KEY (opponent_id) REFERENCES countries(id)
+);
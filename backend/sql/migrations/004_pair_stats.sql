@@ -0,0 +1,25 @@
+-- Head-to-head summary per pair of countries, filled by the ETL (app/aggregates.py).
+-- Apply once to databases created before this table was added to schema.sql:
+--   mysql -u root -p whybother < sql/migrations/004_pair_stats.sql
+-- then run a full (non-incremental) ETL load to fill it.
+USE whybother;
+
+-- One row per pair, lower country id first: /h2h/{a}/{b} is a unique-key lookup.
+CREATE TABLE pair_stats (
+    id                    INT AUTO_INCREMENT PRIMARY KEY,
+    team_a_id             INT NOT NULL,
+    team_b_id             INT NOT NULL,
+    matches               INT NOT NULL DEFAULT 0,
+    team_a_wins           INT NOT NULL DEFAULT 0,
+    team_b_wins           INT NOT NULL DEFAULT 0,
+    draws                 INT NOT NULL DEFAULT 0,
+    team_a_goals          INT NOT NULL DEFAULT 0,
+    team_b_goals          INT NOT NULL DEFAULT 0,
+    team_a_shootout_wins  INT NOT NULL DEFAULT 0,
+    team_b_shootout_wins  INT NOT NULL DEFAULT 0,
+    first_match           DATE,
+    last_match            DATE,
+    UNIQUE KEY uq_pair_stats_teams (team_a_id, team_b_id),
+    FOREIGN KEY (team_a_id) REFERENCES countries(id),
+    FOREIGN KEY (team_b_id) REFERENCES countries(id)
+);
@@ -0,0 +1,31 @@
+-- Replace the country_stats, top_scorers and view_top_scorers views with tables the ETL refreshes.
+-- The views recomputed every match or goal on each SELECT (country_stats joined countries on names);
+-- the tables are keyed by id and rebuilt after each load.
+-- Apply once to databases created before these tables were added to schema.sql:
+--   mysql -u root -p whybother < sql/migrations/005_summary_tables.sql
+-- then run a full (non-incremental) ETL load to fill them.
+USE whybother;
+
+DROP VIEW IF EXISTS country_stats;
+DROP VIEW IF EXISTS top_scorers;
+DROP VIEW IF EXISTS view_top_scorers;
+
+-- All-time results per country, shootout winners counted as winners (the match_results rule)
+CREATE TABLE country_stats (
+    country_id      INT PRIMARY KEY,
+    matches_played  INT NOT NULL DEFAULT 0,
+    wins            INT NOT NULL DEFAULT 0,
+    draws           INT NOT NULL DEFAULT 0,
+    losses          INT NOT NULL DEFAULT 0,
+    FOREIGN KEY (country_id) REFERENCES countries(id)
+);
+
+-- Goals per player; /scorers/ reads the top of ix_scorer_stats_goals
+CREATE TABLE scorer_stats (
+    player_id    INT PRIMARY KEY,
+    country_id   INT NOT NULL,
+    total_goals  INT NOT NULL DEFAULT 0,
+    INDEX ix_scorer_stats_goals (total_goals, player_id),
+    FOREIGN KEY (player_id) REFERENCES players(id),
+    FOREIGN KEY (country_id) REFERENCES countries(id)
+);
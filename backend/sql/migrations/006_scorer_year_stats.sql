@@ -0,0 +1,23 @@
+-- Goals per player per (year, tournament) for the filtered scorer leaderboards (/scorers/leaderboard).
+-- Apply once to databases created before this table was added to schema.sql:
+--   mysql -u root -p whybother < sql/migrations/006_scorer_year_stats.sql
+-- then run a full (non-incremental) ETL load to fill it.
+USE whybother;
+
+-- penalties and own_goals are disjoint parts of goals, so a leaderboard can subtract either or both.
+CREATE TABLE scorer_year_stats (
+    id          INT AUTO_INCREMENT PRIMARY KEY,
+    player_id   INT NOT NULL,
+    country_id  INT NOT NULL,
+    year        INT NOT NULL,
+    tournament  VARCHAR(100),
+    goals       INT NOT NULL DEFAULT 0,
+    penalties   INT NOT NULL DEFAULT 0,
+    own_goals   INT NOT NULL DEFAULT 0,
+    UNIQUE KEY uq_scorer_year_stats_player_year_tournament (player_id, year, tournament),
+    INDEX ix_scorer_year_stats_year (year),
+    INDEX ix_scorer_year_stats_tournament_year (tournament, year),
+    INDEX ix_scorer_year_stats_country_year (country_id, year),
+    FOREIGN KEY (player_id) REFERENCES players(id),
+    FOREIGN KEY (country_id) REFERENCES countries(id)
+);
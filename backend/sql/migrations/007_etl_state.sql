@@ -0,0 +1,16 @@
+-- Per-source checksum and high-water mark that `python -m app.etl --mode incremental` reads to skip
+-- unchanged CSVs and load only new or changed rows.
+-- Apply once to databases created before this table was added to schema.sql:
+--   mysql -u root -p whybother < sql/migrations/007_etl_state.sql
+-- The table predates the numbered migrations, so this is a no-op where schema.sql already created it.
+-- The first incremental run afterwards has no recorded state, so it reads and diffs every source in full.
+USE whybother;
+
+CREATE TABLE IF NOT EXISTS etl_state (
+    id               INT AUTO_INCREMENT PRIMARY KEY,
+    source           VARCHAR(100) NOT NULL UNIQUE,
+    checksum         CHAR(64) NOT NULL,
+    high_water_mark  DATE,
+    row_count        INT,
+    loaded_at        DATETIME
+);
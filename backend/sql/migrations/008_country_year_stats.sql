@@ -0,0 +1,22 @@
+-- Matches, wins, draws, losses and goals per country per year, refreshed by the ETL
+-- (app/aggregates.py). The country profiles, /stats/global and the year routes read it.
+-- Apply once to databases created before this table was added to schema.sql:
+--   mysql -u root -p whybother < sql/migrations/008_country_year_stats.sql
+-- then run a full (non-incremental) ETL load to fill it. The table predates the numbered
+-- migrations, so this is a no-op where schema.sql already created it.
+USE whybother;
+
+CREATE TABLE IF NOT EXISTS country_year_stats (
+    id             INT AUTO_INCREMENT PRIMARY KEY,
+    country_id     INT NOT NULL,
+    year           INT NOT NULL,
+    matches        INT NOT NULL DEFAULT 0,
+    wins           INT NOT NULL DEFAULT 0,
+    draws          INT NOT NULL DEFAULT 0,
+    losses         INT NOT NULL DEFAULT 0,
+    goals_for      INT NOT NULL DEFAULT 0,
+    goals_against  INT NOT NULL DEFAULT 0,
+    UNIQUE KEY uq_country_year_stats_country_year (country_id, year),
+    INDEX ix_country_year_stats_year (year),
+    FOREIGN KEY (country_id) REFERENCES countries(id)
+);
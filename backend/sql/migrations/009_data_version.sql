@@ -0,0 +1,15 @@
+-- Single-row counter the ETL bumps after every load (app/cache.py). The cached analytics routes,
+-- their ETags and the in-memory columnar and leaderboard engines are keyed on it.
+-- Apply once to databases created before this table was added to schema.sql:
+--   mysql -u root -p whybother < sql/migrations/009_data_version.sql
+-- The table predates the numbered migrations, so this is a no-op where schema.sql already created it.
+USE whybother;
+
+CREATE TABLE IF NOT EXISTS data_version (
+    id          INT PRIMARY KEY,
+    version     INT NOT NULL DEFAULT 0,
+    updated_at  DATETIME
+);
+
+-- The ETL reads and bumps the row with id 1; version 0 means nothing has been loaded since
+INSERT IGNORE INTO data_version (id, version, updated_at) VALUES (1, 0, NOW());
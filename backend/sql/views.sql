@@ -19,17 +19,6 @@ FROM matches m
 LEFT JOIN shootouts s ON m.id = s.match_id;
 
 
-CREATE OR REPLACE VIEW view_top_scorers AS
-SELECT
-  p.id AS player_id,
-  p.name AS player_name,
-  c.name AS country_name,
-  COUNT(g.id) AS total_goals
-FROM players p
-JOIN goalscorers g ON g.player_id = p.id
-JOIN countries c ON p.country_id = c.id
-GROUP BY p.id, p.name, c.name;
-
 CREATE OR REPLACE VIEW view_goals_per_country_per_year AS
 SELECT
   c.id AS country_id,
@@ -34,6 +34,11 @@ CREATE TABLE matches (
     city            VARCHAR(100),
     country_id      INT,
     neutral         BOOLEAN DEFAULT FALSE,
+    INDEX ix_matches_date_teams (match_date, home_team_id, away_team_id),
+    INDEX ix_matches_home_team_date (home_team_id, match_date),
+    INDEX ix_matches_away_team_date (away_team_id, match_date),
+    INDEX ix_matches_date_id (match_date, id),
+    INDEX ix_matches_tournament_date_id (tournament, match_date, id),
     FOREIGN KEY (home_team_id) REFERENCES countries(id),
     FOREIGN KEY (away_team_id) REFERENCES countries(id),
     FOREIGN KEY (country_id) REFERENCES countries(id)
@@ -43,6 +48,7 @@ CREATE TABLE players (
     id           INT AUTO_INCREMENT PRIMARY KEY,
     name         VARCHAR(100) NOT NULL,
     country_id   INT NOT NULL,
+    INDEX ix_players_name_country (name, country_id),
     FOREIGN KEY (country_id) REFERENCES countries(id)
 );
 
@@ -54,6 +60,7 @@ CREATE TABLE goalscorers (
     minute     INT,
     own_goal   BOOLEAN DEFAULT FALSE,
     penalty    BOOLEAN DEFAULT FALSE,
+    INDEX ix_goalscorers_player_match (player_id, match_id),
     FOREIGN KEY (match_id) REFERENCES matches(id),
     FOREIGN KEY (player_id) REFERENCES players(id),
     FOREIGN KEY (team_id) REFERENCES countries(id)
@@ -73,3 +80,106 @@ CREATE TABLE shootouts (
     FOREIGN KEY (first_shooter_id) REFERENCES countries(id),
     FOREIGN KEY (match_id) REFERENCES matches(id)
 );
+
+CREATE TABLE etl_state (
+    id               INT AUTO_INCREMENT PRIMARY KEY,
+    source           VARCHAR(100) NOT NULL UNIQUE,
+    checksum         CHAR(64) NOT NULL,
+    high_water_mark  DATE,
+    row_count        INT,
+    loaded_at        DATETIME
+);
+
+CREATE TABLE data_version (
+    id          INT PRIMARY KEY,
+    version     INT NOT NULL DEFAULT 0,
+    updated_at  DATETIME
+);
+
+INSERT INTO data_version (id, version, updated_at) VALUES (1, 0, NOW());
+
+CREATE TABLE country_year_stats (
+    id             INT AUTO_INCREMENT PRIMARY KEY,
+    country_id     INT NOT NULL,
+    year           INT NOT NULL,
+    matches        INT NOT NULL DEFAULT 0,
+    wins           INT NOT NULL DEFAULT 0,
+    draws          INT NOT NULL DEFAULT 0,
+    losses         INT NOT NULL DEFAULT 0,
+    goals_for      INT NOT NULL DEFAULT 0,
+    goals_against  INT NOT NULL DEFAULT 0,
+    UNIQUE KEY uq_country_year_stats_country_year (country_id, year),
+    INDEX ix_country_year_stats_year (year),
+    FOREIGN KEY (country_id) REFERENCES countries(id)
+);
+
+CREATE TABLE pair_stats (
+    id                    INT AUTO_INCREMENT PRIMARY KEY,
+    team_a_id             INT NOT NULL,
+    team_b_id             INT NOT NULL,
+    matches               INT NOT NULL DEFAULT 0,
+    team_a_wins           INT NOT NULL DEFAULT 0,
+    team_b_wins           INT NOT NULL DEFAULT 0,
+    draws                 INT NOT NULL DEFAULT 0,
+    team_a_goals          INT NOT NULL DEFAULT 0,
+    team_b_goals          INT NOT NULL DEFAULT 0,
+    team_a_shootout_wins  INT NOT NULL DEFAULT 0,
+    team_b_shootout_wins  INT NOT NULL DEFAULT 0,
+    first_match           DATE,
+    last_match            DATE,
+    UNIQUE KEY uq_pair_stats_teams (team_a_id, team_b_id),
+    FOREIGN KEY (team_a_id) REFERENCES countries(id),
+    FOREIGN KEY (team_b_id) REFERENCES countries(id)
+);
+
+CREATE TABLE country_stats (
+    country_id      INT PRIMARY KEY,
+    matches_played  INT NOT NULL DEFAULT 0,
+    wins            INT NOT NULL DEFAULT 0,
+    draws           INT NOT NULL DEFAULT 0,
+    losses          INT NOT NULL DEFAULT 0,
+    FOREIGN KEY (country_id) REFERENCES countries(id)
+);
+
+CREATE TABLE scorer_stats (
+    player_id    INT PRIMARY KEY,
+    country_id   INT NOT NULL,
+    total_goals  INT NOT NULL DEFAULT 0,
+    INDEX ix_scorer_stats_goals (total_goals, player_id),
+    FOREIGN KEY (player_id) REFERENCES players(id),
+    FOREIGN KEY (country_id) REFERENCES countries(id)
+);
+
+CREATE TABLE scorer_year_stats (
+    id          INT AUTO_INCREMENT PRIMARY KEY,
+    player_id   INT NOT NULL,
+    country_id  INT NOT NULL,
+    year        INT NOT NULL,
+    tournament  VARCHAR(100),
+    goals       INT NOT NULL DEFAULT 0,
+    penalties   INT NOT NULL DEFAULT 0,
+    own_goals   INT NOT NULL DEFAULT 0,
+    UNIQUE KEY uq_scorer_year_stats_player_year_tournament (player_id, year, tournament),
+    INDEX ix_scorer_year_stats_year (year),
+    INDEX ix_scorer_year_stats_tournament_year (tournament, year),
+    INDEX ix_scorer_year_stats_country_year (country_id, year),
+    FOREIGN KEY (player_id) REFERENCES players(id),
+    FOREIGN KEY (country_id) REFERENCES countries(id)
+);
+
+CREATE TABLE team_ratings (
+    id             INT AUTO_INCREMENT PRIMARY KEY,
+    country_id     INT NOT NULL,
+    match_id       INT NOT NULL,
+    match_date     DATE NOT NULL,
+    opponent_id    INT NOT NULL,
+    result         DOUBLE NOT NULL,
+    rating_before  DOUBLE NOT NULL,
+    rating_after   DOUBLE NOT NULL,
+    UNIQUE KEY uq_team_ratings_match_country (match_id, country_id),
+    INDEX ix_team_ratings_country_date (country_id, match_date, id),
+    INDEX ix_team_ratings_date_country (match_date, country_id, id),
+    FOREIGN KEY (country_id) REFERENCES countries(id),
+    FOREIGN KEY (match_id) REFERENCES matches(id),
+    FOREIGN KEY (opponent_id) REFERENCES countries(id)
+);
@@ -27,33 +27,15 @@ LEFT JOIN countries c1 ON m.home_team_id = c1.id
 LEFT JOIN countries c2 ON m.away_team_id = c2.id
 LEFT JOIN countries c3 ON m.country_id = c3.id
 LEFT JOIN shootouts s ON m.id = s.match_id;
-CREATE OR REPLACE VIEW country_stats AS
+-- country_stats is a table refreshed by the ETL (see schema.sql), keyed by country id
 SELECT
-    name,
-    COUNT(*) AS matches_played,
-    SUM(wins) AS wins,
-    SUM(draws) AS draws,
-    SUM(losses) AS losses
-FROM (
-    SELECT
-        c.name,
-        CASE WHEN mr.winner = c.name THEN 1 ELSE 0 END AS wins,
-        CASE WHEN mr.winner IS NULL THEN 1 ELSE 0 END AS draws,
-        CASE WHEN mr.winner != c.name AND mr.winner IS NOT NULL THEN 1 ELSE 0 END AS losses
-    FROM match_results mr
-    JOIN countries c ON c.name IN (mr.home_team, mr.away_team)
-) sub
-GROUP BY name;
-SELECT
-    p.name AS player,
-    c.name AS country,
-    COUNT(*) AS goals
-FROM goalscorers g
-JOIN players p ON g.player_id = p.id
-JOIN countries c ON p.country_id = c.id
-GROUP BY p.name, c.name
-ORDER BY goals DESC
-LIMIT 20;
+    c.name,
+    s.matches_played,
+    s.wins,
+    s.draws,
+    s.losses
+FROM country_stats s
+JOIN countries c ON c.id = s.country_id;
 SELECT
     c.name AS country,
     m.tournament,
@@ -77,17 +59,17 @@ WHERE (ch.name = 'France' AND ca.name = 'Germany')
    OR (ch.name = 'Germany' AND ca.name = 'France')
 ORDER BY m.match_date DESC;
 
-CREATE OR REPLACE VIEW top_scorers AS
+-- Top scorers come from scorer_stats, goal totals per player refreshed by the ETL
 SELECT
-    p.id AS player_id,
+    s.player_id,
     p.name AS player,
     c.name AS country,
-    COUNT(*) AS total_goals
-FROM goalscorers g
-JOIN players p ON g.player_id = p.id
-JOIN countries c ON p.country_id = c.id
-GROUP BY p.id, p.name, c.name
-ORDER BY total_goals DESC;
+    s.total_goals
+FROM scorer_stats s
+JOIN players p ON p.id = s.player_id
+JOIN countries c ON c.id = s.country_id
+ORDER BY s.total_goals DESC, s.player_id
+LIMIT 20;
 
 CREATE OR REPLACE VIEW tournament_appearances AS
 SELECT
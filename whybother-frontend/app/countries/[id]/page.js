@@ -11,21 +11,45 @@ export default function CountryProfile() {
   const id = params.id;
 
   const [profile, setProfile] = useState(null);
+  const [matches, setMatches] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [error, setError] = useState(null);
   const [fromYear, setFromYear] = useState(1950);
   const [toYear, setToYear] = useState(2022);
 
+  const matchFilters = () => ({
+    date_from: fromYear ? `${fromYear}-01-01` : undefined,
+    date_to: toYear ? `${toYear}-12-31` : undefined,
+    limit: 50,
+  });
+
   const fetchProfile = async () => {
     try {
-      const result = await api.getCountryProfile(id, fromYear, toYear);
+      const [result, page] = await Promise.all([
+        api.getCountryProfile(id, fromYear, toYear),
+        api.getCountryMatches(id, matchFilters()),
+      ]);
       console.log("✅ API Result:", result);
       setProfile(result);
+      setMatches(page.items);
+      setNextCursor(page.nextCursor);
     } catch (err) {
       console.error("❌ Fetch error:", err);
       setError(err.message || "Error loading profile");
     }
   };
 
+  const fetchMoreMatches = async () => {
+    try {
+      const page = await api.getCountryMatches(id, { ...matchFilters(), cursor: nextCursor });
+      setMatches((prev) => prev.concat(page.items));
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      console.error("❌ Fetch error:", err);
+      setError(err.message || "Error loading matches");
+    }
+  };
+
   useEffect(() => {
     if (id) fetchProfile();
   }, [id]);
@@ -84,12 +108,12 @@ export default function CountryProfile() {
             </tr>
           </thead>
           <tbody>
-            {Array.isArray(profile.matches) ? (
-              profile.matches.map((match, idx) => (
-                <tr key={idx}>
-                  <td>{match.date}</td>
+            {matches.length > 0 ? (
+              matches.map((match) => (
+                <tr key={match.id}>
+                  <td>{match.match_date}</td>
                   <td>{match.opponent}</td>
-                  <td>{match.venue}</td>
+                  <td>{match.home ? "Home" : "Away"}</td>
                   <td>{match.score}</td>
                 </tr>
               ))
@@ -98,6 +122,11 @@ export default function CountryProfile() {
             )}
           </tbody>
         </table>
+        {nextCursor && (
+          <button onClick={fetchMoreMatches} style={{ marginTop: "1rem" }}>
+            Load more matches
+          </button>
+        )}
       </main>
     </div>
   );
@@ -15,7 +15,6 @@ export default function YearStatsPage() {
 
   const [stats, setStats] = useState(null);
   const [error, setError] = useState(null);
-  const [countries, setCountries] = useState([]);
   const [selectedYear, setSelectedYear] = useState(year);
 
   useEffect(() => {
@@ -31,33 +30,15 @@ export default function YearStatsPage() {
     if (year) fetchStats();
   }, [year]);
 
-  useEffect(() => {
-    const fetchCountries = async () => {
-      try {
-        const res = await api.getCountries();
-        setCountries(res);
-      } catch (err) {
-        console.error("Failed to load country names");
-      }
-    };
-
-    fetchCountries();
-  }, []);
-
-  const teamName = (id) => {
-    const team = countries.find((c) => c.id === id);
-    return team ? team.name : `Team ${id}`;
-  };
-
   const handleYearChange = (e) => {
     const y = e.target.value;
     setSelectedYear(y);
     router.push(`/years/${y}`);
   };
 
-  const chartData = stats?.top_teams.map(([id, score]) => ({
-    name: teamName(id),
-    goals: score,
+  const chartData = stats?.top_teams.map((team) => ({
+    name: team.country,
+    goals: team.goals,
   }));
 
   if (error) return <div>Error: {error}</div>;
@@ -3,6 +3,24 @@ import axios from "axios";
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || "http://127.0.0.1:8000";
 
+// List endpoints are keyset-paginated: the body is one page and the
+// X-Next-Cursor header (absent on the last page) points at the next one.
+const getPage = async (path, params = {}) => {
+  const res = await axios.get(`${API_BASE_URL}${path}`, { params });
+  return { items: res.data, nextCursor: res.headers["x-next-cursor"] || null };
+};
+
+const getAllPages = async (path, params = {}) => {
+  let items = [];
+  let cursor = null;
+  do {
+    const page = await getPage(path, { ...params, limit: 1000, ...(cursor ? { cursor } : {}) });
+    items = items.concat(page.items);
+    cursor = page.nextCursor;
+  } while (cursor);
+  return items;
+};
+
 const api = {
   getCountryProfile: async (id, fromYear, toYear) => {
     const params = {};
@@ -22,9 +40,12 @@ const api = {
     return res.data;
   },
 
-  getCountryMatches: async (id) => {
-    const res = await axios.get(`${API_BASE_URL}/countries/${id}/matches`);
-    return res.data;
+  getCountryMatches: async (id, { cursor, limit, ...filters } = {}) => {
+    return getPage(`/countries/${id}/matches`, { ...filters, ...(cursor ? { cursor } : {}), ...(limit ? { limit } : {}) });
+  },
+
+  getMatches: async ({ cursor, limit, ...filters } = {}) => {
+    return getPage("/matches/", { ...filters, ...(cursor ? { cursor } : {}), ...(limit ? { limit } : {}) });
   },
 
   getYearStats: async (year) => {
@@ -37,9 +58,16 @@ const api = {
     return res.data;
   },
 
+  getPlayers: async ({ cursor, limit, countryId } = {}) => {
+    const params = {};
+    if (cursor) params.cursor = cursor;
+    if (limit) params.limit = limit;
+    if (countryId) params.country_id = countryId;
+    return getPage("/players/", params);
+  },
+
   getAllPlayers: async () => {
-    const res = await axios.get(`${API_BASE_URL}/players`);
-    return res.data;
+    return getAllPages("/players/");
   },
 
   getPlayer: async (id) => {